@@ -5,6 +5,8 @@ LangGraph DJ Agent for intelligent playlist and vibe management.
 from typing import TypedDict, List, Dict, Optional, Annotated, Sequence, Union
 from datetime import datetime
 import operator
+import random
+from functools import lru_cache
 from langgraph.graph import StateGraph, END
 from langgraph.prebuilt import ToolNode
 from langchain_core.messages import BaseMessage, HumanMessage, AIMessage
@@ -13,8 +15,9 @@ from langchain_core.tools import tool
 import numpy as np
 import logging
 import json
-import sqlite3
+import asyncio
 import os
+import re
 
 from utils.sqlite_db import get_sqlite_db
 from utils.dj_llm import DJLLMService, VibeAnalysis, TrackEvaluation
@@ -32,6 +35,28 @@ formatter = logging.Formatter(
 console_handler.setFormatter(formatter)
 logger.addHandler(console_handler)
 
+# Genre substrings that pick a transition style, each set matched in one pass
+AGGRESSIVE_GENRES_RE = re.compile("techno|hard|industrial")
+CREATIVE_GENRES_RE = re.compile("experimental|ambient|idm")
+
+# Most LLM calls one agent step keeps in flight, to stay under rate limits
+LLM_CONCURRENCY = 6
+
+
+async def gather_bounded(coros, limit: int = LLM_CONCURRENCY) -> List:
+    """Await coroutines with at most ``limit`` running at once.
+
+    Results come back in input order; failures are returned as exceptions
+    rather than raised, as with ``asyncio.gather(..., return_exceptions=True)``.
+    """
+    semaphore = asyncio.Semaphore(limit)
+
+    async def run(coro):
+        async with semaphore:
+            return await coro
+
+    return await asyncio.gather(*(run(coro) for coro in coros), return_exceptions=True)
+
 
 class DJAgentState(TypedDict):
     """State for the DJ agent."""
@@ -73,12 +98,21 @@ async def analyze_hot_cue_transitions(track_filepaths: List[str]) -> Dict:
             "recommendations": [],
         }
 
-        # Get database connection for full file paths
-        db_path = os.path.join(os.path.dirname(__file__), "..", "tracks.db")
-        conn = sqlite3.connect(db_path)
-        cursor = conn.cursor()
+        # Reuse the shared database connection
+        db = get_sqlite_db()
+        cursor = db.adapter.connection.cursor()
+
+        # Each track is in up to two pairs; fetch them all in one IN lookup
+        unique_filepaths = list(dict.fromkeys(track_filepaths))
+        placeholders = ",".join("?" * len(unique_filepaths))
+        cursor.execute(
+            f"SELECT * FROM tracks WHERE filepath IN ({placeholders})",
+            unique_filepaths,
+        )
+        rows_by_path = {row["filepath"]: row for row in cursor.fetchall()}
 
-        # Analyze each consecutive pair of tracks
+        # Collect each consecutive pair of tracks
+        pairs = []
         for i in range(len(track_filepaths) - 1):
             current_filepath = track_filepaths[i]
             next_filepath = track_filepaths[i + 1]
@@ -88,87 +122,86 @@ async def analyze_hot_cue_transitions(track_filepaths: List[str]) -> Dict:
             )
 
             # Get full track data including BPM
-            cursor.execute(
-                "SELECT * FROM tracks WHERE filepath = ?", (current_filepath,)
-            )
-            current_track_data = cursor.fetchone()
-
-            cursor.execute("SELECT * FROM tracks WHERE filepath = ?", (next_filepath,))
-            next_track_data = cursor.fetchone()
+            current_track_data = rows_by_path.get(current_filepath)
+            next_track_data = rows_by_path.get(next_filepath)
 
             if not current_track_data or not next_track_data:
                 logger.warning(f"Missing track data for transition {i + 1}")
                 continue
 
             # Convert to dict
-            columns = [description[0] for description in cursor.description]
-            current_track = dict(zip(columns, current_track_data))
-            next_track = dict(zip(columns, next_track_data))
+            current_track = dict(current_track_data)
+            next_track = dict(next_track_data)
 
             # Get hot cue data from database (already stored from enhanced analysis)
-            try:
-                current_hot_cues = []
-                next_hot_cues = []
+            current_hot_cues = []
+            next_hot_cues = []
 
-                # Parse hot cues from database
-                if current_track.get("hot_cues") and isinstance(
-                    current_track["hot_cues"], str
-                ):
-                    try:
-                        current_hot_cues = json.loads(current_track["hot_cues"])
-                    except (json.JSONDecodeError, TypeError):
-                        pass
+            # Parse hot cues from database
+            if current_track.get("hot_cues") and isinstance(
+                current_track["hot_cues"], str
+            ):
+                try:
+                    current_hot_cues = json.loads(current_track["hot_cues"])
+                except (json.JSONDecodeError, TypeError):
+                    pass
 
-                if next_track.get("hot_cues") and isinstance(
-                    next_track["hot_cues"], str
-                ):
-                    try:
-                        next_hot_cues = json.loads(next_track["hot_cues"])
-                    except (json.JSONDecodeError, TypeError):
-                        pass
+            if next_track.get("hot_cues") and isinstance(next_track["hot_cues"], str):
+                try:
+                    next_hot_cues = json.loads(next_track["hot_cues"])
+                except (json.JSONDecodeError, TypeError):
+                    pass
 
-                if current_hot_cues:
-                    transition_analysis["tracks_with_hot_cues"] += 1
-                if (
-                    next_hot_cues and i == len(track_filepaths) - 2
-                ):  # Count last track too
-                    transition_analysis["tracks_with_hot_cues"] += 1
+            if current_hot_cues:
+                transition_analysis["tracks_with_hot_cues"] += 1
+            if next_hot_cues and i == len(track_filepaths) - 2:  # Count last track too
+                transition_analysis["tracks_with_hot_cues"] += 1
 
-                # Analyze transition compatibility
-                transition_info = await analyze_transition_compatibility(
-                    current_track, next_track, current_hot_cues, next_hot_cues
-                )
+            pairs.append(
+                (i, current_track, next_track, current_hot_cues, next_hot_cues)
+            )
 
-                transition_analysis["transitions"].append(
-                    {
-                        "position": i + 1,
-                        "current_track": {
-                            "filepath": current_filepath,
-                            "title": current_track.get("title", "Unknown"),
-                            "artist": current_track.get("artist", "Unknown"),
-                            "bpm": current_track.get("bpm"),
-                            "hot_cues_count": len(current_hot_cues),
-                        },
-                        "next_track": {
-                            "filepath": next_filepath,
-                            "title": next_track.get("title", "Unknown"),
-                            "artist": next_track.get("artist", "Unknown"),
-                            "bpm": next_track.get("bpm"),
-                            "hot_cues_count": len(next_hot_cues),
-                        },
-                        "compatibility": transition_info,
-                    }
+        # Analyze transition compatibility for all pairs, a few at a time
+        results = await gather_bounded(
+            analyze_transition_compatibility(
+                current_track, next_track, current_hot_cues, next_hot_cues
+            )
+            for _, current_track, next_track, current_hot_cues, next_hot_cues in pairs
+        )
+
+        for pair, transition_info in zip(pairs, results):
+            i, current_track, next_track, current_hot_cues, next_hot_cues = pair
+            if isinstance(transition_info, Exception):
+                logger.error(
+                    f"Error analyzing hot cues for transition {i + 1}: {transition_info}"
                 )
+                continue
 
-                if transition_info.get("score", 0) > 0.6:
-                    transition_analysis["optimal_transitions"] += 1
+            transition_analysis["transitions"].append(
+                {
+                    "position": i + 1,
+                    "current_track": {
+                        "filepath": track_filepaths[i],
+                        "title": current_track.get("title", "Unknown"),
+                        "artist": current_track.get("artist", "Unknown"),
+                        "bpm": current_track.get("bpm"),
+                        "hot_cues_count": len(current_hot_cues),
+                    },
+                    "next_track": {
+                        "filepath": track_filepaths[i + 1],
+                        "title": next_track.get("title", "Unknown"),
+                        "artist": next_track.get("artist", "Unknown"),
+                        "bpm": next_track.get("bpm"),
+                        "hot_cues_count": len(next_hot_cues),
+                    },
+                    "compatibility": transition_info,
+                }
+            )
 
-            except Exception as e:
-                logger.error(f"Error analyzing hot cues for transition {i + 1}: {e}")
-                continue
+            if transition_info.get("score", 0) > 0.6:
+                transition_analysis["optimal_transitions"] += 1
 
         cursor.close()
-        conn.close()
 
         # Generate recommendations
         optimal_ratio = transition_analysis["optimal_transitions"] / max(
@@ -229,16 +262,13 @@ async def analyze_transition_compatibility(
     try:
         # Determine DJ style based on context
         dj_style = "smooth"  # Default
-        current_genre = current_track.get("genre", "").lower()
-        next_genre = next_track.get("genre", "").lower()
+        genres = (
+            current_track.get("genre", "").lower() + next_track.get("genre", "").lower()
+        )
 
-        if any(
-            g in current_genre + next_genre for g in ["techno", "hard", "industrial"]
-        ):
+        if AGGRESSIVE_GENRES_RE.search(genres):
             dj_style = "aggressive"
-        elif any(
-            g in current_genre + next_genre for g in ["experimental", "ambient", "idm"]
-        ):
+        elif CREATIVE_GENRES_RE.search(genres):
             dj_style = "creative"
 
         # Get AI transition plan
@@ -373,6 +403,49 @@ async def analyze_transition_compatibility(
     return compatibility
 
 
+# ORDER BY clause for each way search_tracks_by_vibe can rank tracks
+VIBE_SEARCH_ORDER = {
+    "building": "bpm ASC",  # Lower BPM first, building up
+    "cooling": "bpm DESC",  # Higher BPM first, cooling down
+    "target": "ABS(COALESCE(bpm, 120) - ?)",  # Closest to a target BPM
+}
+
+
+@lru_cache(maxsize=32)
+def vibe_search_sql(
+    has_bpm_range: bool, genre_count: int, order: Optional[str]
+) -> str:
+    """SQL for one shape of vibe search, with every value left as a parameter.
+
+    Parameters bind in order: BPM min and max, one LIKE pattern per genre,
+    the target BPM for "target" ordering, then the row limit. With no order,
+    the query selects the id of every match (no limit) for sampling.
+    """
+    conditions = []
+    if has_bpm_range:
+        conditions.append("(bpm BETWEEN ? AND ? OR bpm IS NULL)")
+    if genre_count:
+        genre_conditions = " OR ".join(["genre LIKE ?"] * genre_count)
+        conditions.append(f"({genre_conditions} OR genre IS NULL)")
+
+    where_clause = " AND ".join(conditions) if conditions else "1=1"
+    if order is None:
+        return f"SELECT id FROM tracks WHERE {where_clause}"
+    return f"""
+        SELECT * FROM tracks
+        WHERE {where_clause}
+        ORDER BY {VIBE_SEARCH_ORDER[order]}
+        LIMIT ?
+    """
+
+
+@lru_cache(maxsize=64)
+def sql_tracks_by_id(count: int) -> str:
+    """SELECT of whole track rows for `count` track ids."""
+    placeholders = ",".join("?" * count)
+    return f"SELECT * FROM tracks WHERE id IN ({placeholders})"
+
+
 @tool
 async def search_tracks_by_vibe(vibe_keywords: str, limit: int = 20) -> List[Dict]:
     """Search for tracks that match the given vibe keywords using AI analysis.
@@ -413,69 +486,55 @@ async def search_tracks_by_vibe(vibe_keywords: str, limit: int = 20) -> List[Dic
     db = get_sqlite_db()
     cursor = db.adapter.connection.cursor()
 
-    # Build intelligent query based on AI analysis
-    query_conditions = []
-    order_by = []
+    # Build intelligent query based on AI analysis. Values are bound as
+    # parameters, so each query shape is prepared once per connection.
+    params = []
 
     # TODO: Add energy level filtering once values are populated using librosa/essentia
     # For now, we'll query by BPM only
 
     # BPM-based filtering
-    if vibe_analysis.bpm_range:
-        query_conditions.append(
-            f"(bpm BETWEEN {vibe_analysis.bpm_range['min']} AND {vibe_analysis.bpm_range['max']} OR bpm IS NULL)"
-        )
+    bpm_range = vibe_analysis.bpm_range
+    if bpm_range:
+        params += [bpm_range["min"], bpm_range["max"]]
 
     # Genre filtering if specified and not empty
-    if vibe_analysis.genre_preferences and len(vibe_analysis.genre_preferences) > 0:
-        genre_conditions = " OR ".join(
-            [f"genre LIKE '%{g}%'" for g in vibe_analysis.genre_preferences[:3]]
-        )
-        query_conditions.append(f"({genre_conditions} OR genre IS NULL)")
-
-    # Combine conditions
-    where_clause = " AND ".join(query_conditions) if query_conditions else "1=1"
-    logger.debug(f"   📊 Query conditions: {query_conditions}")
-    logger.debug(f"   📊 Where clause: {where_clause}")
+    genres = (vibe_analysis.genre_preferences or [])[:3]
+    params += [f"%{g}%" for g in genres]
 
     # Smart ordering based on vibe
     # TODO: Use energy_level once values are populated
     # For now, use BPM as a proxy for energy
-    if vibe_analysis.energy_progression == "building":
-        order_by.append("bpm ASC")  # Lower BPM first, building up
-    elif vibe_analysis.energy_progression == "cooling":
-        order_by.append("bpm DESC")  # Higher BPM first, cooling down
-    else:
-        # Order by closeness to target BPM (middle of range)
-        if vibe_analysis.bpm_range:
-            target_bpm = (
-                vibe_analysis.bpm_range["min"] + vibe_analysis.bpm_range["max"]
-            ) / 2
-            order_by.append(f"ABS(COALESCE(bpm, 120) - {target_bpm})")
-        else:
-            order_by.append("RANDOM()")
-
-    order_clause = ", ".join(order_by) if order_by else "RANDOM()"
+    order = vibe_analysis.energy_progression
+    if order not in ("building", "cooling"):
+        # Order by closeness to target BPM (middle of range), else randomly
+        order = "target" if bpm_range else None
+    if order == "target":
+        params.append((bpm_range["min"] + bpm_range["max"]) / 2)
 
     # Execute intelligent query
-    query = f"""
-        SELECT * FROM tracks 
-        WHERE {where_clause}
-        ORDER BY {order_clause}
-        LIMIT ?
-    """
-
+    query = vibe_search_sql(bool(bpm_range), len(genres), order)
     logger.debug(f"   📊 Executing AI-driven query: {query}")
-    logger.debug(f"   📊 Query limit: {limit * 2}")
-    cursor.execute(query, (limit * 2,))  # Get extra for AI filtering
+    logger.debug(f"   📊 Query params: {params}")
+
+    if order is None:
+        # Sample matching ids here instead of sorting every row by RANDOM()
+        cursor.execute(query, params)
+        ids = [row[0] for row in cursor.fetchall()]
+        picked = random.sample(ids, min(limit * 2, len(ids)))
+        cursor.execute(sql_tracks_by_id(len(picked)), picked)
+        rows_by_id = {row["id"]: row for row in cursor.fetchall()}
+        rows = [rows_by_id[track_id] for track_id in picked]
+    else:
+        params.append(limit * 2)  # Get extra for AI filtering
+        cursor.execute(query, params)
+        rows = cursor.fetchall()
 
-    columns = [description[0] for description in cursor.description]
     all_tracks = []
-    rows = cursor.fetchall()
     logger.debug(f"   📊 Raw query returned {len(rows)} rows")
 
     for row in rows:
-        track = dict(zip(columns, row))
+        track = dict(row)
         # Parse beat_times if it's a JSON string
         if track.get("beat_times") and isinstance(track["beat_times"], str):
             try:
@@ -483,25 +542,33 @@ async def search_tracks_by_vibe(vibe_keywords: str, limit: int = 20) -> List[Dic
             except (json.JSONDecodeError, TypeError):
                 track["beat_times"] = []
 
-        # Always estimate energy since database values might be NULL
-        # TODO: Store calculated energy values back to database
-        track["energy_level"] = dj_service.estimate_energy_from_features(
-            track.get("bpm"), track.get("genre")
-        )
+        # Analyzed tracks carry a stored energy level; estimate the rest
+        if track.get("energy_level") is None:
+            track["energy_level"] = dj_service.estimate_energy_from_features(
+                track.get("bpm"), track.get("genre")
+            )
 
         all_tracks.append(track)
 
     cursor.close()
 
-    # Let AI evaluate and rank tracks
+    # Let AI evaluate and rank up to 2x limit tracks, a few calls at a time
+    candidates = all_tracks[: limit * 2]
+    evaluations = await gather_bounded(
+        dj_service.evaluate_track(track, vibe_analysis) for track in candidates
+    )
+
     evaluated_tracks = []
-    for track in all_tracks[: limit * 2]:  # Evaluate up to 2x limit
-        try:
-            evaluation = await dj_service.evaluate_track(track, vibe_analysis)
+    for track, evaluation in zip(candidates, evaluations):
+        if not isinstance(evaluation, Exception):
             if evaluation.score > 0.3:  # Only include decent matches
                 evaluated_tracks.append({"track": track, "evaluation": evaluation})
-        except Exception:
+        else:
             # Fallback: include with default score
+            logger.warning(
+                f"   ⚠️ AI evaluation failed for {track.get('filepath')}, "
+                f"using default score: {evaluation}"
+            )
             evaluated_tracks.append(
                 {
                     "track": track,
@@ -549,14 +616,13 @@ def get_track_details(track_filepath: str) -> Dict:
     cursor = db.adapter.connection.cursor()
 
     cursor.execute("SELECT * FROM tracks WHERE filepath = ?", (track_filepath,))
-    columns = [description[0] for description in cursor.description]
     row = cursor.fetchone()
     cursor.close()
 
     if not row:
         return {"error": "Track not found"}
 
-    track = dict(zip(columns, row))
+    track = dict(row)
 
     # Parse beat_times if needed
     if track.get("beat_times") and isinstance(track["beat_times"], str):
@@ -598,22 +664,30 @@ async def filter_tracks_by_energy(
     )
 
     for track in tracks:
-        # Always estimate energy since database values might be NULL
-        # TODO: Store calculated energy values back to database
-        track["energy_level"] = dj_service.estimate_energy_from_features(
-            track.get("bpm"), track.get("genre")
-        )
+        # Analyzed tracks carry a stored energy level; estimate the rest
+        if track.get("energy_level") is None:
+            track["energy_level"] = dj_service.estimate_energy_from_features(
+                track.get("bpm"), track.get("genre")
+            )
 
-        # Use AI to evaluate if this track matches the target energy
-        try:
-            evaluation = await dj_service.evaluate_track(track, target_vibe)
+    # Use AI to evaluate which tracks match the target energy, a few at a time
+    evaluations = await gather_bounded(
+        dj_service.evaluate_track(track, target_vibe) for track in tracks
+    )
+
+    for track, evaluation in zip(tracks, evaluations):
+        if not isinstance(evaluation, Exception):
             if evaluation.energy_match > (1 - tolerance):
                 filtered.append(track)
                 logger.debug(
                     f"   ✅ {track.get('title')} - Energy match: {evaluation.energy_match:.2f}"
                 )
-        except Exception:
+        else:
             # Fallback to simple comparison
+            logger.warning(
+                f"   ⚠️ AI evaluation failed for {track.get('filepath')}, "
+                f"comparing stored energy instead: {evaluation}"
+            )
             energy = track.get("energy_level", 0.5)
             if abs(energy - target_energy) <= tolerance:
                 filtered.append(track)
@@ -639,7 +713,6 @@ async def finalize_playlist(
         Dictionary with success status and AI-enhanced playlist details
     """
     from utils.dj_llm import DJLLMService
-    import sqlite3
     import os
 
     logger.info(
@@ -662,25 +735,27 @@ async def finalize_playlist(
             duplicate_indices.append(i)
             logger.warning(f"⚠️ Duplicate track found at position {i + 1}: {filepath}")
 
-    # Get track metadata from database
-    db_path = os.path.join(os.path.dirname(__file__), "..", "tracks.db")
-    conn = sqlite3.connect(db_path)
-    cursor = conn.cursor()
+    # Get track metadata from the shared database connection
+    db = get_sqlite_db()
+    cursor = db.adapter.connection.cursor()
+
+    # One IN lookup for the whole playlist instead of a query per track
+    placeholders = ",".join("?" * len(unique_filepaths))
+    cursor.execute(
+        f"""
+        SELECT filepath, title, artist, bpm, key, energy_level, duration, genre
+        FROM tracks WHERE filepath IN ({placeholders})
+    """,
+        unique_filepaths,
+    )
+    rows_by_path = {row["filepath"]: row for row in cursor.fetchall()}
 
     track_data = []
     for filepath in unique_filepaths:
-        cursor.execute(
-            """
-            SELECT filepath, title, artist, bpm, key, energy_level, duration, genre
-            FROM tracks WHERE filepath = ?
-        """,
-            (filepath,),
-        )
-        result = cursor.fetchone()
+        result = rows_by_path.get(filepath)
 
         if result:
-            columns = [description[0] for description in cursor.description]
-            track_dict = dict(zip(columns, result))
+            track_dict = dict(result)
             track_data.append(track_dict)
         else:
             # Basic fallback for missing data
@@ -694,7 +769,7 @@ async def finalize_playlist(
                 }
             )
 
-    conn.close()
+    cursor.close()
 
     # Use AI to finalize playlist
     dj_service = DJLLMService()
@@ -1148,11 +1223,10 @@ class DJAgent:
             (vibe_analysis["track_id"], bpm - 10, bpm + 10),
         )
 
-        columns = [description[0] for description in cursor.description]
         candidates = []
 
         for row in cursor.fetchall():
-            track = dict(zip(columns, row))
+            track = dict(row)
 
             # Parse beat_times if needed
             if track.get("beat_times") and isinstance(track["beat_times"], str):
@@ -1452,14 +1526,13 @@ What track should I play after {current_track}?"""
         # Load current track from DB
         cursor = self.db.adapter.connection.cursor()
         cursor.execute("SELECT * FROM tracks WHERE filepath = ?", (current_track_id,))
-        columns = [description[0] for description in cursor.description]
         row = cursor.fetchone()
         cursor.close()
 
         if not row:
             return {"error": "Track not found"}
 
-        current_track = dict(zip(columns, row))
+        current_track = dict(row)
 
         # Parse beat_times if needed
         if current_track.get("beat_times") and isinstance(
@@ -1706,29 +1779,36 @@ What track should I play after {current_track}?"""
             enriched_playlist = []
             if finalized_playlist:
                 logger.info("📚 Enriching playlist with full track metadata...")
+                filepaths = [
+                    track["filepath"]
+                    for track in finalized_playlist
+                    if isinstance(track, dict) and track.get("filepath")
+                ]
+
+                # One IN lookup for the whole playlist instead of a query per track
                 cursor = self.db.adapter.connection.cursor()
+                placeholders = ",".join("?" * len(filepaths))
+                cursor.execute(
+                    f"""
+                    SELECT filepath, title, artist, bpm, key, energy_level, duration, genre
+                    FROM tracks WHERE filepath IN ({placeholders})
+                    """,
+                    filepaths,
+                )
+                # The shared connection returns sqlite3.Row objects
+                rows_by_path = {row["filepath"]: row for row in cursor.fetchall()}
 
                 for track in finalized_playlist:
                     filepath = (
                         track.get("filepath") if isinstance(track, dict) else None
                     )
                     if filepath:
-                        cursor.execute(
-                            """
-                            SELECT filepath, title, artist, bpm, key, energy_level, duration, genre
-                            FROM tracks WHERE filepath = ?
-                            """,
-                            (filepath,),
-                        )
-                        result = cursor.fetchone()
+                        result = rows_by_path.get(filepath)
 
                         if result:
-                            columns = [
-                                description[0] for description in cursor.description
-                            ]
-                            full_track = dict(zip(columns, result))
+                            full_track = dict(result)
                             # Preserve mixing notes if they exist
-                            if isinstance(track, dict) and "mixing_note" in track:
+                            if "mixing_note" in track:
                                 full_track["mixing_note"] = track["mixing_note"]
                             enriched_playlist.append(full_track)
                         else:
@@ -1741,9 +1821,7 @@ What track should I play after {current_track}?"""
                                     "artist": "Unknown",
                                     "bpm": 120,
                                     "energy_level": 0.5,
-                                    "mixing_note": track.get("mixing_note", "")
-                                    if isinstance(track, dict)
-                                    else "",
+                                    "mixing_note": track.get("mixing_note", ""),
                                 }
                             )
 
@@ -1837,14 +1915,13 @@ What track should I play after {current_track}?"""
         # Load seed track from SQLite
         cursor = self.db.adapter.connection.cursor()
         cursor.execute("SELECT * FROM tracks WHERE filepath = ?", (seed_track_id,))
-        columns = [description[0] for description in cursor.description]
         row = cursor.fetchone()
         cursor.close()
 
         if not row:
             return {"success": False, "error": "Seed track not found"}
 
-        seed_track = dict(zip(columns, row))
+        seed_track = dict(row)
 
         # Parse beat_times if needed
         if seed_track.get("beat_times") and isinstance(seed_track["beat_times"], str):
@@ -1894,3 +1971,19 @@ What track should I play after {current_track}?"""
             "vibe_analysis": result["vibe_analysis"],
             "energy_flow": [t.get("energy_level", 0.5) for t in result["playlist"]],
         }
+
+
+_dj_agent: Optional[DJAgent] = None
+
+
+def get_dj_agent() -> DJAgent:
+    """Get the shared DJ agent, building its LLM clients and graphs once.
+
+    The agent keeps no per-request state (each run gets its own graph state
+    and thread id), so concurrent requests can share it. It is created on
+    first use rather than at startup, since that needs an OpenAI API key.
+    """
+    global _dj_agent
+    if _dj_agent is None:
+        _dj_agent = DJAgent()
+    return _dj_agent
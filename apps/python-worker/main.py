@@ -8,42 +8,69 @@ import os
 MUSIC_DIR = os.path.expanduser("~/Downloads")  # We'll use Downloads folder for testing
 os.environ["MUSIC_DIR"] = MUSIC_DIR
 
-from utils.librosa import run_beat_track
+from utils.librosa import safe_beat_track, warm_up
+from utils.analysis_pool import get_analysis_pool, reset_analysis_pool
 from utils.id3_reader import extract_artwork
 from utils.db import get_db
-from agents.dj_agent import DJAgent  # Import the DJ agent
-from fastapi import FastAPI, HTTPException, Request, BackgroundTasks
+from agents.dj_agent import get_dj_agent  # Import the DJ agent
+from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import Response, StreamingResponse
-from utils.sqlite_db import get_sqlite_db
+from fastapi.responses import (
+    FileResponse,
+    ORJSONResponse,
+    Response,
+    StreamingResponse,
+)
+from utils.sqlite_db import get_sqlite_db, unpack_beat_times
+from utils.sqlite_pool import SQLitePool
 from utils.db_migrations import run_migrations
 from utils.music_library import MusicLibraryManager
 from utils.analysis_queue import AnalysisQueue
 from utils.file_watcher import MusicFolderWatcher
 from utils.enhanced_analyzer import EnhancedTrackAnalyzer
 from utils.metadata_analyzer import MetadataAnalyzer
+from utils.serato_reader import serato_reader
 
 from pydantic import BaseModel
-from typing import List, Optional, Dict, Any
-import mimetypes
+from typing import List, Optional, Dict, Any, Iterator, Tuple
+from functools import lru_cache
 import asyncio
+import anyio
+import gzip
+import logging
+import re
+import stat
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 import sqlite3
-from datetime import datetime
-import json
+import uuid
+import orjson
 
 # Import the AI router - temporarily disabled
 # from routers.ai_router import router as ai_router
 
+# Request logging; per-request detail is DEBUG, so set LOG_LEVEL=DEBUG to see it
+logger = logging.getLogger("streamie.api")
+logger.setLevel(os.environ.get("LOG_LEVEL", "INFO").upper())
+_log_handler = logging.StreamHandler()
+_log_handler.setFormatter(
+    logging.Formatter("%(asctime)s - %(levelname)s - %(message)s")
+)
+logger.addHandler(_log_handler)
+
 # Create FastAPI app instance
-app = FastAPI(title="AI DJ Backend")
+app = FastAPI(title="AI DJ Backend", default_response_class=ORJSONResponse)
 
 # Enable CORS for our Next.js frontend
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["http://localhost:3000", "http://localhost:3001"],
     allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+    # Explicit lists avoid echoing arbitrary request headers on preflights
+    allow_methods=["GET", "HEAD", "POST", "PUT", "DELETE", "OPTIONS"],
+    allow_headers=["Content-Type", "Range", "Accept", "Authorization"],
+    max_age=86400,  # let browsers cache preflight responses for a day
 )
 
 # Include the AI router - temporarily disabled
@@ -74,6 +101,52 @@ class TrackInfo(BaseModel):
     # mood field removed - it's stored as a dict in SQLite
 
 
+TRACK_INFO_FIELDS = tuple(TrackInfo.model_fields)
+TRACK_INFO_COLUMNS = ", ".join(TRACK_INFO_FIELDS)
+
+# SQL used on hot paths. Keeping one string per query means sqlite3's
+# per-connection statement cache hits instead of re-preparing.
+SQL_LIST_TRACKS = f"""
+    SELECT {TRACK_INFO_COLUMNS}
+    FROM tracks
+    ORDER BY artist, album, title
+"""
+
+SQL_TRACK_ANALYSIS = """
+    SELECT t.bpm,
+           CASE WHEN b.beat_times IS NULL THEN t.beat_times END,
+           b.beat_times,
+           t.energy_level
+    FROM tracks t LEFT JOIN track_beat_times b USING (filepath)
+    WHERE t.filepath = ?
+"""
+
+SQL_TRACK_HAS_ARTWORK = "SELECT has_artwork FROM tracks WHERE filepath = ?"
+
+
+@lru_cache(maxsize=64)
+def sql_track_infos_by_path(count: int) -> str:
+    """SELECT for ``count`` filepaths; one cached string per IN-list length."""
+    placeholders = ",".join("?" * count)
+    return f"SELECT {TRACK_INFO_COLUMNS} FROM tracks WHERE filepath IN ({placeholders})"
+
+
+@lru_cache(maxsize=64)
+def sql_cached_bpms(count: int) -> str:
+    """bpm_cache SELECT for ``count`` absolute paths."""
+    placeholders = ",".join("?" * count)
+    return (
+        "SELECT filepath, mtime_ns, size, bpm FROM bpm_cache "
+        f"WHERE filepath IN ({placeholders})"
+    )
+
+
+SQL_STORE_BPM = """
+    INSERT OR REPLACE INTO bpm_cache (filepath, mtime_ns, size, bpm)
+    VALUES (?, ?, ?, ?)
+"""
+
+
 class TrackDBInfo(TrackInfo):
     """Track info stored in the database including beat timestamps."""
 
@@ -120,6 +193,27 @@ class AnalysisStatusResponse(BaseModel):
     running: bool
 
 
+# Read size for partial-content audio responses
+STREAM_CHUNK_SIZE = 1024 * 1024
+
+# Rows per chunk when streaming /tracks as NDJSON
+NDJSON_BATCH_SIZE = 500
+NDJSON_LINE = orjson.OPT_APPEND_NEWLINE
+
+# Single byte range as sent by audio elements, e.g. "bytes=0-1023"
+RANGE_HEADER_RE = re.compile(r"bytes=(\d*)-(\d*)")
+
+# Content types for the formats the library scans; anything else is sent as MP3
+AUDIO_MIME_TYPES = {
+    ".mp3": "audio/mpeg",
+    ".m4a": "audio/mp4",
+    ".m4p": "audio/mp4",
+    ".wav": "audio/wav",
+    ".flac": "audio/flac",
+    ".ogg": "audio/ogg",
+    ".aac": "audio/aac",
+}
+
 # Global instances
 db_path = os.path.join(os.path.dirname(__file__), "tracks.db")
 music_library = MusicLibraryManager(db_path)
@@ -127,6 +221,141 @@ analysis_queue = AnalysisQueue(db_path)
 file_watcher = MusicFolderWatcher(analysis_queue, db_path)
 enhanced_analyzer = EnhancedTrackAnalyzer(db_path)
 metadata_analyzer = MetadataAnalyzer(db_path)
+db_pool = SQLitePool(db_path)
+
+# Single thread for bulk metadata scans, kept apart from request handling
+_metadata_scan_executor: Optional[ThreadPoolExecutor] = None
+_metadata_scan: Optional[Future] = None
+
+
+def get_metadata_scan_executor() -> ThreadPoolExecutor:
+    """Return the executor that runs metadata scans one at a time."""
+    global _metadata_scan_executor
+    if _metadata_scan_executor is None:
+        _metadata_scan_executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="metadata-scan"
+        )
+    return _metadata_scan_executor
+
+
+def log_metadata_scan_failure(scan: Future):
+    """Log the error a metadata scan died with; nothing else awaits it."""
+    if scan.cancelled():
+        return
+    error = scan.exception()
+    if error is not None:
+        logger.error("❌ Metadata scan failed: %s", error, exc_info=error)
+
+
+# Recent os.stat results; seek-heavy clients hit the same files repeatedly.
+# Only for resolving paths: sizes and ETags sent to clients need a fresh stat.
+STAT_CACHE_TTL = 60.0
+STAT_CACHE_MAX = 8192
+_stat_cache: Dict[str, Tuple[float, os.stat_result]] = {}
+
+
+def cached_stat(path: str) -> os.stat_result:
+    """os.stat that reuses results for up to STAT_CACHE_TTL seconds.
+
+    Misses are not cached; a missing file raises FileNotFoundError each time.
+    """
+    now = time.monotonic()
+    hit = _stat_cache.get(path)
+    if hit is not None and now - hit[0] < STAT_CACHE_TTL:
+        return hit[1]
+
+    st = os.stat(path)
+    if len(_stat_cache) >= STAT_CACHE_MAX:
+        _stat_cache.clear()
+    _stat_cache[path] = (now, st)
+    return st
+
+
+@lru_cache(maxsize=4096)
+def locate_track(filepath: str) -> Tuple[str, str]:
+    """Resolve a track path to (absolute path, MIME type).
+
+    Relative paths are tried against this directory, then ~/Downloads and
+    ~/Music. Only regular files with an audio extension resolve, so these
+    routes can't be used to read the database or other files on disk. Misses
+    raise FileNotFoundError, so only hits are cached; call
+    locate_track.cache_clear() after the library changes on disk.
+    """
+    ext = os.path.splitext(filepath)[1].lower()
+    content_type = AUDIO_MIME_TYPES.get(ext)
+    if content_type is None:
+        raise FileNotFoundError(filepath)
+
+    if os.path.isabs(filepath):
+        candidates = (filepath,)
+    else:
+        candidates = (
+            os.path.abspath(os.path.join(os.path.dirname(__file__), filepath)),
+            os.path.expanduser(f"~/Downloads/{filepath}"),
+            os.path.expanduser(f"~/Music/{filepath}"),
+        )
+
+    for file_path in candidates:
+        try:
+            st = cached_stat(file_path)
+        except OSError:
+            continue
+        if stat.S_ISREG(st.st_mode):
+            return file_path, content_type
+
+    raise FileNotFoundError(filepath)
+
+
+def get_track_analysis_from_db(filepath: str) -> Optional[sqlite3.Row]:
+    """Fetch (bpm, beat_times_json, beat_times_f32, energy_level) for a track.
+
+    The JSON beat_times is only read when no packed copy exists, so its
+    overflow pages stay on disk. Borrows a pooled connection so it can be
+    called from executor threads.
+    """
+    with db_pool.acquire() as conn:
+        return conn.execute(SQL_TRACK_ANALYSIS, (filepath,)).fetchone()
+
+
+def fetch_track_artwork_flag(filepath: str) -> Optional[sqlite3.Row]:
+    """Fetch (has_artwork,) for a track, or None if it is not in the library."""
+    with db_pool.acquire() as conn:
+        return conn.execute(SQL_TRACK_HAS_ARTWORK, (filepath,)).fetchone()
+
+
+def get_track_infos_from_db(filepaths: List[str]) -> Dict[str, sqlite3.Row]:
+    """Fetch the TrackInfo columns for several tracks in one query."""
+    if not filepaths:
+        return {}
+
+    with db_pool.acquire() as conn:
+        rows = conn.execute(
+            sql_track_infos_by_path(len(filepaths)), filepaths
+        ).fetchall()
+    return {row["filepath"]: row for row in rows}
+
+
+async def get_tracks_from_db(filepaths: List[str]) -> List[Optional[sqlite3.Row]]:
+    """Look up several tracks off the event loop, preserving input order."""
+    loop = asyncio.get_running_loop()
+    by_path = await loop.run_in_executor(None, get_track_infos_from_db, filepaths)
+    return [by_path.get(fp) for fp in filepaths]
+
+
+def tracks_awaiting_analysis() -> List[str]:
+    """Tracks needing analysis that aren't already pending in the queue."""
+    with db_pool.acquire() as conn:
+        queued = {
+            row[0]
+            for row in conn.execute(
+                "SELECT filepath FROM analysis_queue WHERE status = 'pending'"
+            )
+        }
+    return [
+        filepath
+        for filepath in music_library.get_tracks_needing_any_analysis()
+        if filepath not in queued
+    ]
 
 
 @app.on_event("startup")
@@ -135,11 +364,40 @@ async def startup_event():
     # Run database migrations
     run_migrations(db_path)
 
+    # Open the event loop's adapter connection now rather than on the first
+    # request; tool threads open their own on first use
+    get_sqlite_db().adapter.connection
+
+    get_analysis_pool()
+
+    # Blocking file reads (Serato tags, artwork) go to the default executor;
+    # size it so concurrent requests overlap instead of queueing
+    asyncio.get_running_loop().set_default_executor(
+        ThreadPoolExecutor(max_workers=32, thread_name_prefix="io")
+    )
+    # Sync streaming bodies (ranged audio reads, NDJSON listings) iterate on
+    # anyio's worker threads, 40 at a time by default; allow more listeners
+    anyio.to_thread.current_default_thread_limiter().total_tokens = 64
+
+    # Open the first pooled connection (and switch the database to WAL)
+    with db_pool.acquire():
+        pass
+
+    # Compile analysis kernels in the background; nothing waits on this
+    asyncio.get_running_loop().run_in_executor(None, warm_up)
+
     # Check if this is first run
     if music_library.is_first_run():
-        print("🎵 First run detected - please configure music folders")
+        logger.info("🎵 First run detected - please configure music folders")
+    elif os.environ.get("ANALYZE_ON_STARTUP") == "1":
+        # Work through anything left unanalyzed in the background, so the
+        # analysis endpoints read stored results instead of decoding audio
+        await analysis_queue.start(enhanced_analyzer)
+        pending = await asyncio.to_thread(tracks_awaiting_analysis)
+        queued = await analysis_queue.add_tracks_bulk(pending)
+        logger.info("✅ Music library ready - queued %d tracks for analysis", queued)
     else:
-        print(
+        logger.info(
             "✅ Music library ready - tracks available, analysis on manual request only"
         )
 
@@ -147,7 +405,13 @@ async def startup_event():
 @app.on_event("shutdown")
 async def shutdown_event():
     """Cleanup on shutdown."""
-    pass  # No cleanup needed - analysis queue only starts on manual request
+    # Analysis queue only runs after a manual request or ANALYZE_ON_STARTUP=1
+    if analysis_queue.running:
+        await analysis_queue.stop()
+    reset_analysis_pool()
+    if _metadata_scan_executor is not None:
+        _metadata_scan_executor.shutdown(wait=False, cancel_futures=True)
+    db_pool.close()
 
 
 @app.get("/")
@@ -160,74 +424,207 @@ async def root():
 async def list_tracks_from_db():
     """Return track info stored in MongoDB."""
     db = get_db()
-    docs = list(db.tracks.find({}))
-    tracks = []
-    for d in docs:
-        d.pop("_id", None)
-        tracks.append(TrackDBInfo(**d))
-    return tracks
+    # Fetch only the model's fields; response_model validates the output
+    # once, so skip a second validation pass per document here
+    projection = {"_id": 0, **dict.fromkeys(TrackDBInfo.model_fields, 1)}
+    return [TrackDBInfo.model_construct(**d) for d in db.tracks.find({}, projection)]
+
+
+def _db_version() -> Tuple[Tuple[int, int], ...]:
+    """Stat signature of tracks.db and its WAL; changes on every committed write."""
+    version = []
+    for path in (db_path, db_path + "-wal"):
+        try:
+            st = os.stat(path)
+        except OSError:
+            version.append((0, 0))
+        else:
+            version.append((st.st_mtime_ns, st.st_size))
+    return tuple(version)
+
+
+# include_bpm -> (db version, encoded /tracks body, gzipped body once requested)
+_tracks_payload_cache: Dict[
+    bool, Tuple[Tuple[Tuple[int, int], ...], bytes, Optional[bytes]]
+] = {}
+
+
+def tracks_etag(
+    version: Tuple[Tuple[int, int], ...], include_bpm: bool, gzipped: bool
+) -> str:
+    """Strong ETag for one encoding of a /tracks body at a database version."""
+    tag = "-".join(f"{mtime_ns:x}-{size:x}" for mtime_ns, size in version)
+    return f'"{tag}-{int(include_bpm)}{"-gz" if gzipped else ""}"'
+
+
+def track_row_to_dict(row: tuple, include_bpm: bool) -> Dict[str, Any]:
+    """Shape a SQL_LIST_TRACKS row like TrackInfo.
+
+    Rows come from our own table, so they are encoded directly rather than
+    validated through the model.
+    """
+    (
+        filename,
+        filepath,
+        duration,
+        title,
+        artist,
+        album,
+        genre,
+        year,
+        has_artwork,
+        bpm,
+    ) = row
+    return {
+        "filename": filename,
+        "filepath": filepath,
+        "duration": duration,
+        "title": title,
+        "artist": artist,
+        "album": album,
+        "genre": genre,
+        "year": year,
+        "has_artwork": bool(has_artwork),
+        "bpm": bpm if include_bpm else None,
+    }
+
+
+def encode_track_list(include_bpm: bool) -> bytes:
+    """Read every track and encode the /tracks JSON body."""
+    with db_pool.acquire() as conn:
+        # Plain tuples; columns are unpacked by position
+        cursor = conn.cursor()
+        cursor.row_factory = None
+
+        # Get all tracks from the database
+        cursor.execute(SQL_LIST_TRACKS)
+        rows = cursor.fetchall()
+
+    tracks = [track_row_to_dict(row, include_bpm) for row in rows]
+
+    logger.debug("✅ Found %d tracks in database", len(tracks))
+    return orjson.dumps(tracks)
+
+
+def iter_track_list_ndjson(include_bpm: bool) -> Iterator[bytes]:
+    """Yield the track list as NDJSON, one batch of rows per chunk."""
+    # Read everything up front so a slow client never holds a pooled
+    # connection (or an open read snapshot blocking WAL checkpoints)
+    with db_pool.acquire() as conn:
+        cursor = conn.cursor()
+        cursor.row_factory = None
+        rows = cursor.execute(SQL_LIST_TRACKS).fetchall()
+
+    for start in range(0, len(rows), NDJSON_BATCH_SIZE):
+        yield b"".join(
+            orjson.dumps(track_row_to_dict(row, include_bpm), option=NDJSON_LINE)
+            for row in rows[start : start + NDJSON_BATCH_SIZE]
+        )
 
 
 @app.get("/tracks", response_model=List[TrackInfo])
-async def list_tracks(include_bpm: bool = False):
-    """List all tracks from the database"""
-    conn = sqlite3.connect(db_path)
-    conn.row_factory = sqlite3.Row
-    cursor = conn.cursor()
+async def list_tracks(request: Request, include_bpm: bool = False):
+    """List all tracks from the database.
+
+    Clients sending ``Accept: application/x-ndjson`` get one track per line,
+    streamed as rows are read, instead of a single JSON array.
+    """
+    if "application/x-ndjson" in request.headers.get("accept", ""):
+        return StreamingResponse(
+            iter_track_list_ndjson(include_bpm), media_type="application/x-ndjson"
+        )
 
     try:
-        # Get all tracks from the database
-        cursor.execute("""
-            SELECT filename, filepath, duration, title, artist, album, 
-                   genre, year, has_artwork, bpm
-            FROM tracks
-            ORDER BY artist, album, title
-        """)
-
-        tracks = []
-        for row in cursor.fetchall():
-            track_dict = dict(row)
-
-            # Create TrackInfo object
-            track_info = TrackInfo(
-                filename=track_dict.get("filename", ""),
-                filepath=track_dict.get("filepath", ""),
-                duration=track_dict.get("duration", 0.0),
-                title=track_dict.get("title"),
-                artist=track_dict.get("artist"),
-                album=track_dict.get("album"),
-                genre=track_dict.get("genre"),
-                year=track_dict.get("year"),
-                has_artwork=track_dict.get("has_artwork", False),
-                bpm=track_dict.get("bpm") if include_bpm else None,
+        version = _db_version()
+        gzipped = "gzip" in request.headers.get("accept-encoding", "")
+
+        # Unchanged database since the client's copy: skip the body entirely
+        headers = {
+            "ETag": tracks_etag(version, include_bpm, gzipped),
+            "Vary": "Accept-Encoding",
+        }
+        if request.headers.get("if-none-match") == headers["ETag"]:
+            return Response(status_code=304, headers=headers)
+
+        cached = _tracks_payload_cache.get(include_bpm)
+        if not cached or cached[0] != version:
+            payload = await asyncio.to_thread(encode_track_list, include_bpm)
+            cached = (version, payload, None)
+            _tracks_payload_cache[include_bpm] = cached
+
+        if not gzipped:
+            return Response(
+                content=cached[1], media_type="application/json", headers=headers
             )
-            tracks.append(track_info)
 
-        print(f"✅ Found {len(tracks)} tracks in database")
-        return tracks
+        # Compress once per database version and reuse for every client
+        compressed = cached[2]
+        if compressed is None:
+            compressed = await asyncio.to_thread(gzip.compress, cached[1], 6)
+            _tracks_payload_cache[include_bpm] = (version, cached[1], compressed)
+        headers["Content-Encoding"] = "gzip"
+        return Response(
+            content=compressed, media_type="application/json", headers=headers
+        )
 
     except Exception as e:
-        print(f"❌ Error fetching tracks from database: {e}")
+        logger.error("❌ Error fetching tracks from database: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
-    finally:
-        conn.close()
+
+
+def batch_file_keys(
+    filepaths: List[str],
+) -> List[Optional[Tuple[str, int, int]]]:
+    """Resolve and stat each batch path, giving (path, mtime_ns, size) or None.
+
+    Relative paths are taken against this directory; None marks a missing file.
+    """
+    keys = []
+    for filepath in filepaths:
+        file_path = os.path.abspath(os.path.join(os.path.dirname(__file__), filepath))
+        try:
+            st = os.stat(file_path)
+        except OSError:
+            keys.append(None)
+        else:
+            keys.append((file_path, st.st_mtime_ns, st.st_size))
+    return keys
+
+
+def load_cached_bpms(
+    keys: List[Optional[Tuple[str, int, int]]],
+) -> Dict[Tuple[str, int, int], float]:
+    """Stored BPMs for the keys whose file is unchanged since it was analyzed."""
+    file_paths = list({key[0] for key in keys if key is not None})
+    if not file_paths:
+        return {}
+
+    with db_pool.acquire() as conn:
+        rows = conn.execute(sql_cached_bpms(len(file_paths)), file_paths).fetchall()
+    return {(row[0], row[1], row[2]): row[3] for row in rows}
+
+
+def store_bpms(entries: List[Tuple[str, int, int, float]]):
+    """Record (path, mtime_ns, size, bpm) results for later batches."""
+    with db_pool.acquire() as conn, conn:
+        conn.executemany(SQL_STORE_BPM, entries)
 
 
 @app.post("/tracks/batch-analyze")
 async def batch_analyze_tracks(filepaths: List[str]):
     """Analyze BPM for multiple tracks in batch"""
+    loop = asyncio.get_running_loop()
+    pool = get_analysis_pool()
     results = []
+    # Results waiting on each file, so a path listed twice is analyzed once
+    jobs: Dict[Tuple[str, int, int], List[Dict[str, Any]]] = {}
 
-    for filepath in filepaths:
-        # Handle absolute or relative paths
-        if os.path.isabs(filepath):
-            file_path = filepath
-        else:
-            file_path = os.path.abspath(
-                os.path.join(os.path.dirname(__file__), filepath)
-            )
+    # Validate every path and look up earlier results up front, off the loop
+    keys = await asyncio.to_thread(batch_file_keys, filepaths)
+    cached = await asyncio.to_thread(load_cached_bpms, keys)
 
-        if not os.path.exists(file_path):
+    for filepath, key in zip(filepaths, keys):
+        if key is None:
             results.append(
                 {
                     "filepath": filepath,
@@ -238,83 +635,133 @@ async def batch_analyze_tracks(filepaths: List[str]):
             )
             continue
 
-        try:
-            bpm = run_beat_track(file_path)
-            results.append({"filepath": filepath, "bpm": bpm, "success": True})
-        except Exception as e:
-            results.append(
-                {"filepath": filepath, "bpm": None, "success": False, "error": str(e)}
-            )
+        cached_bpm = cached.get(key)
+        if cached_bpm is not None:
+            results.append({"filepath": filepath, "bpm": cached_bpm, "success": True})
+            continue
+
+        result = {"filepath": filepath, "bpm": None, "success": True}
+        results.append(result)
+        jobs.setdefault(key, []).append(result)
+
+    # Beat tracking is CPU-bound, so each file runs in its own process
+    outcomes = await asyncio.gather(
+        *(loop.run_in_executor(pool, safe_beat_track, key[0]) for key in jobs),
+        return_exceptions=True,
+    )
+    analyzed = []
+    for (key, waiting), outcome in zip(jobs.items(), outcomes):
+        if isinstance(outcome, BaseException):
+            # The pool itself failed, e.g. a worker was killed mid-file
+            bpm, error = None, str(outcome) or type(outcome).__name__
+        else:
+            bpm, error = outcome
+        if error is None:
+            analyzed.append((*key, bpm))
+        for result in waiting:
+            if error is not None:
+                result["success"] = False
+                result["error"] = error
+            else:
+                result["bpm"] = bpm
+
+    if analyzed:
+        await asyncio.to_thread(store_bpms, analyzed)
+
+    # A dead worker breaks the whole pool; start fresh on the next batch
+    if any(isinstance(outcome, BrokenProcessPool) for outcome in outcomes):
+        reset_analysis_pool()
 
     return results
 
 
-@app.get("/track/{filepath:path}/analysis", response_model=TrackAnalysisResponse)
-async def analyze_track_enhanced(filepath: str):
-    """Get comprehensive track analysis including BPM - Serato temporarily disabled"""
-    # First check if the filepath is absolute or relative
-    if os.path.isabs(filepath):
-        file_path = filepath
-    else:
-        # Try to resolve the relative path
-        # Check if it's relative to the python-worker directory
-        file_path = os.path.abspath(os.path.join(os.path.dirname(__file__), filepath))
+@lru_cache(maxsize=1024)
+def get_serato_info(file_path: str, mtime: float) -> Dict[str, Any]:
+    """Serato tags for a file, parsed once per (path, mtime).
 
-    if not os.path.exists(file_path):
-        raise HTTPException(status_code=404, detail="Track not found")
+    Tags only change when the file does, so this survives the analysis
+    cache being cleared by finished jobs.
+    """
+    return serato_reader.get_serato_info(file_path)
 
-    try:
-        print(f"🎧 ANALYZING TRACK: {os.path.basename(filepath)}")
-
-        # Look up precomputed analysis in the SQLite database
-        db_sqlite = get_sqlite_db()
-        cursor = db_sqlite.adapter.connection.cursor()
-        cursor.execute("SELECT * FROM tracks WHERE filepath = ?", (filepath,))
-        columns = [description[0] for description in cursor.description]
-        row = cursor.fetchone()
-        cursor.close()
-
-        doc = None
-        if row:
-            doc = dict(zip(columns, row))
-            # Parse beat_times if it's a JSON string
-            if doc.get("beat_times") and isinstance(doc["beat_times"], str):
-                try:
-                    doc["beat_times"] = json.loads(doc["beat_times"])
-                except json.JSONDecodeError:
-                    doc["beat_times"] = []  # Default to empty list on error
-            elif not doc.get("beat_times"):
-                doc["beat_times"] = []  # Ensure beat_times exists
-
-        if not doc:
-            # Track not found in database - no live analysis fallback
-            print(f"❌ Track not found in database: {filepath}")
-            raise HTTPException(
-                status_code=404,
-                detail="Track not found in database. Please run track analysis first to populate BPM data.",
-            )
 
-        # Get BPM and other data only from database
-        bpm = doc.get("bpm")
-        if bpm is None or bpm <= 0:
-            print(f"❌ No valid BPM data available for track: {filepath} (BPM: {bpm})")
-            raise HTTPException(
-                status_code=422,
-                detail="No valid BPM data available for this track in database.",
-            )
+# Encoded analysis responses. Other workers and scripts also write tracks, so
+# entries only live a few seconds, and at most a few hundred bodies are kept.
+ANALYSIS_CACHE_TTL = 5.0
+ANALYSIS_CACHE_MAX = 256
+_analysis_cache: Dict[Tuple[str, str, float, bool], Tuple[float, bytes]] = {}
 
-        beat_times = doc.get("beat_times", [])
-        mood = doc.get("mood")  # mood might not be in SQLite schema yet
-        energy_level = doc.get("energy_level")  # energy_level from SQLite
-        print(
-            f"🎵 Database BPM: {bpm:.2f} BPM ({len(beat_times)} beats), Energy: {energy_level}"
+
+def cached_analysis(
+    filepath: str, file_path: str, mtime: float, include_serato: bool = True
+) -> bytes:
+    """_analysis_impl that reuses a body for up to ANALYSIS_CACHE_TTL seconds.
+
+    Edits to the file change the key, and the analysis queue clears the cache
+    whenever a job in this process completes. Errors are not cached.
+    """
+    key = (filepath, file_path, mtime, include_serato)
+    now = time.monotonic()
+    hit = _analysis_cache.get(key)
+    if hit is not None and now - hit[0] < ANALYSIS_CACHE_TTL:
+        return hit[1]
+
+    body = _analysis_impl(filepath, file_path, mtime, include_serato)
+    if len(_analysis_cache) >= ANALYSIS_CACHE_MAX:
+        _analysis_cache.clear()
+    _analysis_cache[key] = (now, body)
+    return body
+
+
+def _analysis_impl(
+    filepath: str, file_path: str, mtime: float, include_serato: bool = True
+) -> bytes:
+    """Build the analysis response for a track, encoded as JSON."""
+    logger.debug("🎧 ANALYZING TRACK: %s", filepath)
+
+    # Look up precomputed analysis in the SQLite database
+    row = get_track_analysis_from_db(filepath)
+
+    if not row:
+        # Track not found in database - no live analysis fallback
+        logger.info("❌ Track not found in database: %s", filepath)
+        raise HTTPException(
+            status_code=404,
+            detail="Track not found in database. Please run track analysis first to populate BPM data.",
         )
 
-        # Enable Serato hot cue extraction
+    # Get BPM and other data only from database
+    bpm, beat_times_json, beat_times_f32, energy_level = row
+    if bpm is None or bpm <= 0:
+        logger.info("❌ No valid BPM data for track: %s (BPM: %s)", filepath, bpm)
+        raise HTTPException(
+            status_code=422,
+            detail="No valid BPM data available for this track in database.",
+        )
+
+    # Prefer the packed float32 beat grid; fall back to the JSON string
+    beat_times = []
+    if beat_times_f32:
+        beat_times = unpack_beat_times(beat_times_f32)
+    elif beat_times_json:
         try:
-            from utils.serato_reader import serato_reader
+            beat_times = orjson.loads(beat_times_json)
+        except orjson.JSONDecodeError:
+            pass  # Default to empty list on error
+    mood = None  # mood is not in the SQLite schema yet
+    logger.debug(
+        "🎵 Database BPM: %.2f BPM (%d beats), Energy: %s",
+        bpm,
+        len(beat_times),
+        energy_level,
+    )
 
-            serato_info = serato_reader.get_serato_info(file_path)
+    # Serato hot cue extraction, unless the caller only needs the beat grid
+    serato_info = {"hot_cues": [], "serato_available": False}
+    hot_cues = []
+    if include_serato:
+        try:
+            serato_info = get_serato_info(file_path, mtime)
             hot_cues = [
                 SeratoHotCue(
                     name=cue["name"],
@@ -325,71 +772,112 @@ async def analyze_track_enhanced(filepath: str):
                 )
                 for cue in serato_info.get("hot_cues", [])
             ]
-            print(f"🎛️ Extracted {len(hot_cues)} hot cues from Serato data")
+            logger.debug("🎛️ Extracted %d hot cues from Serato", len(hot_cues))
         except Exception as e:
-            print(f"❌ Error extracting Serato hot cues: {e}")
+            logger.warning("❌ Error extracting Serato hot cues: %s", e)
             serato_info = {"hot_cues": [], "serato_available": False}
             hot_cues = []
 
-        # Suggested transitions based on BPM only (no Serato)
-        suggested_transitions = {
-            "filter_sweep": bpm > 120,
-            "echo_effect": 100 <= bpm <= 140,
-            "scratch_compatible": bpm >= 80,
-            "has_serato_cues": False,  # Disabled
-            "loop_ready": False,  # Disabled
-        }
+    # Suggested transitions based on BPM only (no Serato)
+    suggested_transitions = {
+        "filter_sweep": bpm > 120,
+        "echo_effect": 100 <= bpm <= 140,
+        "scratch_compatible": bpm >= 80,
+        "has_serato_cues": False,  # Disabled
+        "loop_ready": False,  # Disabled
+    }
 
-        response = TrackAnalysisResponse(
-            bpm=bpm,
-            beat_times=beat_times,  # Ensure this is a list
-            mood=mood,
-            success=True,
-            confidence=0.85,  # Standard confidence without Serato
-            analysis_time="enhanced",
-            suggested_transitions=suggested_transitions,
-            serato_data=serato_info,
-            hot_cues=hot_cues,
-        )
+    response = TrackAnalysisResponse(
+        bpm=bpm,
+        beat_times=beat_times,  # Ensure this is a list
+        mood=mood,
+        success=True,
+        confidence=0.85,  # Standard confidence without Serato
+        analysis_time="enhanced",
+        suggested_transitions=suggested_transitions,
+        serato_data=serato_info,
+        hot_cues=hot_cues,
+    )
 
-        print(f"✅ Analysis complete: {bpm:.2f} BPM, mood={mood}")
-        return response
+    logger.debug("✅ Analysis complete: %.2f BPM, mood=%s", bpm, mood)
+    return orjson.dumps(response.model_dump())
 
-    except Exception as e:
-        print(f"❌ Analysis failed: {str(e)}")
-        raise HTTPException(status_code=500, detail=str(e))
 
+# Finished analysis jobs rewrite the rows the cached responses were built from
+analysis_queue.on_complete = lambda _filepath: _analysis_cache.clear()
 
-@app.get("/track/{filepath:path}/artwork")
-async def get_artwork(filepath: str):
-    """Get album artwork for a track"""
-    # Handle absolute or relative paths
+
+@app.get("/track/{filepath:path}/analysis", response_model=TrackAnalysisResponse)
+async def analyze_track_enhanced(filepath: str, include_serato: bool = True):
+    """Get comprehensive track analysis including BPM.
+
+    Pass ``include_serato=false`` to skip reading Serato hot cues from the file
+    when only the BPM and beat grid are needed.
+    """
+    # First check if the filepath is absolute or relative
     if os.path.isabs(filepath):
         file_path = filepath
     else:
-        # First try relative to current directory
+        # Try to resolve the relative path
+        # Check if it's relative to the python-worker directory
         file_path = os.path.abspath(os.path.join(os.path.dirname(__file__), filepath))
 
-        # If not found, try common music directories
-        if not os.path.exists(file_path):
-            # Try in Downloads
-            downloads_path = os.path.expanduser(f"~/Downloads/{filepath}")
-            if os.path.exists(downloads_path):
-                file_path = downloads_path
-            else:
-                # Try in Music folder
-                music_path = os.path.expanduser(f"~/Music/{filepath}")
-                if os.path.exists(music_path):
-                    file_path = music_path
+    # Stat directly: a minute-old mtime could serve a stale body after an edit
+    try:
+        mtime = os.stat(file_path).st_mtime
+    except OSError:
+        raise HTTPException(status_code=404, detail="Track not found")
+
+    try:
+        body = await asyncio.to_thread(
+            cached_analysis, filepath, file_path, mtime, include_serato
+        )
+        # Already validated when built; send the cached bytes as-is
+        return Response(content=body, media_type="application/json")
 
-    if not os.path.exists(file_path):
+    except Exception as e:
+        logger.error("❌ Analysis failed: %s", e)
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+def file_etag(st: os.stat_result) -> str:
+    """Strong ETag for content derived from a file; changes when it's rewritten."""
+    return f'"{st.st_mtime_ns:x}-{st.st_size:x}"'
+
+
+# Browsers may reuse artwork for an hour, then revalidate with If-None-Match
+ARTWORK_CACHE_CONTROL = "public, max-age=3600"
+
+
+@app.get("/track/{filepath:path}/artwork")
+async def get_artwork(filepath: str, request: Request):
+    """Get album artwork for a track"""
+    # The library scan already recorded whether the file carries artwork
+    row = await asyncio.to_thread(fetch_track_artwork_flag, filepath)
+    if row is not None and not row[0]:
+        raise HTTPException(status_code=404, detail="No artwork found")
+
+    try:
+        file_path, _ = locate_track(filepath)
+        # Stat afresh: tag editors rewrite files in place, and a cached stat
+        # would keep handing out the old ETag
+        st = os.stat(file_path)
+    except FileNotFoundError:
         raise HTTPException(status_code=404, detail="Track not found")
 
+    # Artwork only changes with the file, so a matching tag skips extraction
+    headers = {
+        "ETag": file_etag(st),
+        "Cache-Control": ARTWORK_CACHE_CONTROL,
+    }
+    if request.headers.get("if-none-match") == headers["ETag"]:
+        return Response(status_code=304, headers=headers)
+
     try:
-        artwork_data = extract_artwork(file_path)
+        artwork_data = await asyncio.to_thread(extract_artwork, file_path)
         if artwork_data:
             image_data, mime_type = artwork_data
-            return Response(content=image_data, media_type=mime_type)
+            return Response(content=image_data, media_type=mime_type, headers=headers)
         else:
             raise HTTPException(status_code=404, detail="No artwork found")
     except Exception as e:
@@ -399,81 +887,77 @@ async def get_artwork(filepath: str):
 @app.get("/track/{filepath:path}/stream")
 async def stream_audio(filepath: str, request: Request):
     """Stream audio file with support for range requests (seeking)"""
-    # Handle absolute or relative paths
-    if os.path.isabs(filepath):
-        file_path = filepath
-    else:
-        # First try relative to current directory
-        file_path = os.path.abspath(os.path.join(os.path.dirname(__file__), filepath))
-
-        # If not found, try common music directories
-        if not os.path.exists(file_path):
-            # Try in Downloads
-            downloads_path = os.path.expanduser(f"~/Downloads/{filepath}")
-            if os.path.exists(downloads_path):
-                file_path = downloads_path
-            else:
-                # Try in Music folder
-                music_path = os.path.expanduser(f"~/Music/{filepath}")
-                if os.path.exists(music_path):
-                    file_path = music_path
 
-    # Log the path being accessed
-    print(f"🎵 Streaming request for: {filepath}")
-    print(f"🎵 Resolved path: {file_path}")
-    print(f"🎵 File exists: {os.path.exists(file_path)}")
+    range_header = request.headers.get("Range")
 
-    if not os.path.exists(file_path):
+    try:
+        file_path, content_type = locate_track(filepath)
+        if range_header:
+            # Size ranged responses from the handle the body is read from: a
+            # cached stat can predate an in-place rewrite (Serato, tag
+            # editors), and a shrunk file would end the body early
+            file = await asyncio.to_thread(open, file_path, "rb", buffering=0)
+            file_size = os.fstat(file.fileno()).st_size
+    except FileNotFoundError:
         # Try to give more helpful error message
-        print(f"❌ File not found: {file_path}")
+        logger.info("❌ File not found: %s", filepath)
         raise HTTPException(
             status_code=404, detail=f"Track not found at path: {filepath}"
         )
 
-    try:
-        file_size = os.path.getsize(file_path)
-
-        # Get the range header if present
-        range_header = request.headers.get("Range")
-
-        # Determine content type
-        content_type, _ = mimetypes.guess_type(file_path)
-        if not content_type:
-            content_type = "audio/mpeg"  # Default to MP3
+    logger.debug("🎵 Streaming %s", file_path)
 
+    try:
         if range_header:
             # Parse range header (e.g., "bytes=0-1023")
             byte_start = 0
             byte_end = file_size - 1
 
-            if range_header.startswith("bytes="):
-                range_spec = range_header[6:]
-                if "-" in range_spec:
-                    start_str, end_str = range_spec.split("-", 1)
-                    if start_str:
-                        byte_start = int(start_str)
-                    if end_str:
-                        byte_end = int(end_str)
-
-            # Ensure valid range
-            byte_start = max(0, byte_start)
+            match = RANGE_HEADER_RE.match(range_header)
+            if match:
+                start_str, end_str = match.groups()
+                if start_str:
+                    byte_start = int(start_str)
+                if end_str:
+                    byte_end = int(end_str)
+
+            # Ranges starting past the end (or ending before the start) can't
+            # be served; anything running past the end is clamped to it
             byte_end = min(file_size - 1, byte_end)
+            if byte_start >= file_size or byte_end < byte_start:
+                file.close()
+                return Response(
+                    status_code=416,  # Range Not Satisfiable
+                    headers={
+                        "Content-Range": f"bytes */{file_size}",
+                        "Accept-Ranges": "bytes",
+                    },
+                )
             content_length = byte_end - byte_start + 1
 
-            def iterfile(file_path: str, start: int, chunk_size: int = 8192):
-                with open(file_path, "rb") as file:
+            def iterfile(file, start: int, chunk_size: int = STREAM_CHUNK_SIZE):
+                # Read into one reusable buffer; only the yielded copy is new
+                buf = memoryview(bytearray(min(chunk_size, content_length)))
+                with file:
+                    if hasattr(os, "posix_fadvise"):
+                        # Let the kernel read ahead aggressively for this span
+                        os.posix_fadvise(
+                            file.fileno(),
+                            start,
+                            content_length,
+                            os.POSIX_FADV_SEQUENTIAL,
+                        )
                     file.seek(start)
                     remaining = content_length
                     while remaining > 0:
-                        to_read = min(chunk_size, remaining)
-                        data = file.read(to_read)
-                        if not data:
+                        n = file.readinto(buf[: min(len(buf), remaining)])
+                        if not n:
                             break
-                        remaining -= len(data)
-                        yield data
+                        remaining -= n
+                        yield bytes(buf[:n])
 
             return StreamingResponse(
-                iterfile(file_path, byte_start),
+                iterfile(file, byte_start),
                 status_code=206,  # Partial Content
                 headers={
                     "Content-Type": content_type,
@@ -484,20 +968,11 @@ async def stream_audio(filepath: str, request: Request):
                 },
             )
         else:
-            # No range header, serve entire file
-            def iterfile(file_path: str, chunk_size: int = 8192):
-                with open(file_path, "rb") as file:
-                    while True:
-                        data = file.read(chunk_size)
-                        if not data:
-                            break
-                        yield data
-
-            return StreamingResponse(
-                iterfile(file_path),
+            # No range header, let Starlette send the whole file
+            return FileResponse(
+                file_path,
+                media_type=content_type,
                 headers={
-                    "Content-Type": content_type,
-                    "Content-Length": str(file_size),
                     "Accept-Ranges": "bytes",
                     "Cache-Control": "no-cache",
                 },
@@ -510,21 +985,21 @@ async def stream_audio(filepath: str, request: Request):
 async def generate_vibe_playlist(request: VibePlaylistRequest):
     """Generate a playlist based on vibe description using DJ agent"""
     try:
-        print("\n" + "=" * 60)
-        print("🎨 VIBE PLAYLIST REQUEST")
-        print(f"   Vibe: '{request.vibe_description}'")
-        print(f"   Length: {request.playlist_length} tracks")
-        print("=" * 60)
+        logger.info(
+            "🎨 Vibe playlist request: '%s' (%d tracks)",
+            request.vibe_description,
+            request.playlist_length,
+        )
 
-        # Initialize DJ agent
-        dj_agent = DJAgent()
+        # Shared DJ agent, built on the first request
+        dj_agent = get_dj_agent()
 
         # Generate playlist using the new agentic approach
         result = await dj_agent.generate_playlist(
             vibe_description=request.vibe_description,
             length=request.playlist_length,
             energy_pattern="wave",
-            thread_id=f"vibe-{datetime.now().timestamp()}",  # Unique thread ID
+            thread_id=f"vibe-{uuid.uuid4().hex}",  # Unique thread ID
         )
 
         if not result["success"]:
@@ -536,53 +1011,49 @@ async def generate_vibe_playlist(request: VibePlaylistRequest):
         # Parse the agent's response to extract playlist
         response_text = result["response"]
 
-        print(f"\n🤖 Agent Response:\n{response_text}")
+        logger.debug("🤖 Agent response:\n%s", response_text)
 
         # Extract the finalized playlist from the agent
         finalized_playlist = result.get("finalized_playlist", [])
         playlist_tracks = []
 
         if finalized_playlist:
-            print(
-                f"\n✅ Agent provided structured playlist with {len(finalized_playlist)} tracks"
+            logger.debug(
+                "✅ Agent provided structured playlist with %d tracks",
+                len(finalized_playlist),
             )
 
-            # Load our SQLite database to get full track info
-            db_path = os.path.join(os.path.dirname(__file__), "tracks.db")
-            conn = sqlite3.connect(db_path)
-            cursor = conn.cursor()
-
             # Get full track info for each filepath in the playlist
-            for item in finalized_playlist:
-                filepath = item.get("filepath")
-                if not filepath:
-                    continue
-
-                cursor.execute("SELECT * FROM tracks WHERE filepath = ?", (filepath,))
-                columns = [description[0] for description in cursor.description]
-                row = cursor.fetchone()
-
-                if row:
-                    track = dict(zip(columns, row))
-                    track_info = TrackInfo(
-                        filename=track.get("filename", ""),
-                        filepath=track.get("filepath", ""),
-                        duration=track.get("duration", 0.0),
-                        title=track.get("title"),
-                        artist=track.get("artist"),
-                        album=track.get("album"),
-                        genre=track.get("genre"),
-                        year=track.get("year"),
-                        has_artwork=track.get("has_artwork", False),
-                        bpm=track.get("bpm"),
+            items = [item for item in finalized_playlist if item.get("filepath")]
+            tracks = await get_tracks_from_db([item["filepath"] for item in items])
+
+            for item, track in zip(items, tracks):
+                if track:
+                    # Rows come straight from the tracks table, so skip
+                    # re-validation and only coerce the SQLite integer flag
+                    title = track["title"]
+                    artist = track["artist"]
+                    track_info = TrackInfo.model_construct(
+                        filename=track["filename"] or "",
+                        filepath=track["filepath"],
+                        duration=track["duration"] or 0.0,
+                        title=title,
+                        artist=artist,
+                        album=track["album"],
+                        genre=track["genre"],
+                        year=track["year"],
+                        has_artwork=bool(track["has_artwork"]),
+                        bpm=track["bpm"],
                     )
                     playlist_tracks.append(track_info)
-                    print(
-                        f"   {item['order']}. {track.get('title', 'Unknown')} - {track.get('artist', 'Unknown')} ({item.get('mixing_note', '')})"
-                    )
-
-            cursor.close()
-            conn.close()
+                    if logger.isEnabledFor(logging.DEBUG):
+                        logger.debug(
+                            "   %s. %s - %s (%s)",
+                            item["order"],
+                            title or "Unknown",
+                            artist or "Unknown",
+                            item.get("mixing_note", ""),
+                        )
 
         # Create vibe analysis response
         vibe_analysis_response = {
@@ -592,8 +1063,7 @@ async def generate_vibe_playlist(request: VibePlaylistRequest):
             "success": True,
         }
 
-        print(f"\n✅ Playlist generated: {len(playlist_tracks)} tracks")
-        print("=" * 60 + "\n")
+        logger.info("✅ Playlist generated: %d tracks", len(playlist_tracks))
 
         return VibePlaylistResponse(
             playlist=playlist_tracks,
@@ -602,39 +1072,48 @@ async def generate_vibe_playlist(request: VibePlaylistRequest):
         )
 
     except Exception as e:
-        print(f"❌ Error in generate_vibe_playlist: {str(e)}")
-        import traceback
-
-        traceback.print_exc()
+        logger.exception("❌ Error in generate_vibe_playlist: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 
+def _sse(obj: Any) -> bytes:
+    """Encode one SSE data event; agent results may carry numpy scalars."""
+    return (
+        b"data: "
+        + orjson.dumps(
+            obj, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+        )
+        + b"\n\n"
+    )
+
+
 @app.get("/ai/generate-vibe-playlist-stream")
 async def generate_vibe_playlist_stream(
     vibe_description: str, playlist_length: int = 10
 ):
     """Stream the AI agent's thinking process while generating a playlist"""
-    from queue import Queue
-    import logging
     from utils.dj_agent_stream import DJAgentStreamEnhancer
 
     async def event_generator():
         # Create a queue to capture log messages
-        log_queue = Queue()
+        loop = asyncio.get_running_loop()
+        log_queue: asyncio.Queue = asyncio.Queue()
 
         # Create stream enhancer
         stream_enhancer = DJAgentStreamEnhancer()
 
-        # Custom handler to capture DJ agent logs
+        # Custom handler to capture DJ agent logs (may fire from other threads)
         class QueueHandler(logging.Handler):
             def emit(self, record):
-                log_queue.put(self.format(record))
+                loop.call_soon_threadsafe(log_queue.put_nowait, self.format(record))
 
         # Add our handler to the DJ agent logger
         dj_logger = logging.getLogger("DJAgent")
         queue_handler = QueueHandler()
         queue_handler.setFormatter(logging.Formatter("%(message)s"))
         dj_logger.addHandler(queue_handler)
+        generation_task = None
+        next_log = None
 
         try:
             # Send initial stage update
@@ -647,10 +1126,10 @@ async def generate_vibe_playlist_stream(
                 "message": f"Starting playlist generation for: {vibe_description}",
                 "data": {},
             }
-            yield f"data: {json.dumps(initial_data)}\n\n"
+            yield _sse(initial_data)
 
-            # Initialize DJ agent
-            dj_agent = DJAgent()
+            # Shared DJ agent, built on the first request
+            dj_agent = get_dj_agent()
 
             # Start playlist generation in a separate task
             generation_task = asyncio.create_task(
@@ -658,35 +1137,43 @@ async def generate_vibe_playlist_stream(
                     vibe_description=vibe_description,
                     length=playlist_length,
                     energy_pattern="wave",
-                    thread_id=f"vibe-stream-{datetime.now().timestamp()}",
+                    thread_id=f"vibe-stream-{uuid.uuid4().hex}",
                 )
             )
 
-            # Stream log messages while generation is running
-            while not generation_task.done():
-                # Check for new log messages
-                while not log_queue.empty():
-                    log_msg = log_queue.get()
-                    # Process message through enhancer
-                    if log_msg.strip():
-                        enhanced_data = stream_enhancer.process_message(log_msg)
-                        yield f"data: {json.dumps(enhanced_data)}\n\n"
+            # Stream log messages as they arrive while generation is running
+            while True:
+                next_log = asyncio.ensure_future(log_queue.get())
+                done, _ = await asyncio.wait(
+                    {next_log, generation_task}, return_when=asyncio.FIRST_COMPLETED
+                )
+                if next_log not in done:
+                    next_log.cancel()
+                    break
 
-                # Small delay to prevent busy waiting
-                await asyncio.sleep(0.1)
+                log_msg = next_log.result()
+                # Process message through enhancer
+                if log_msg.strip():
+                    enhanced_data = stream_enhancer.process_message(log_msg)
+                    yield _sse(enhanced_data)
 
             # Get the final result
             result = await generation_task
 
             # Send any remaining log messages
             while not log_queue.empty():
-                log_msg = log_queue.get()
+                log_msg = log_queue.get_nowait()
                 if log_msg.strip():
                     enhanced_data = stream_enhancer.process_message(log_msg)
-                    yield f"data: {json.dumps(enhanced_data)}\n\n"
+                    yield _sse(enhanced_data)
 
             if not result["success"]:
-                yield f"data: {json.dumps({'type': 'error', 'message': result.get('error', 'Failed to generate playlist')})}\n\n"
+                yield _sse(
+                    {
+                        "type": "error",
+                        "message": result.get("error", "Failed to generate playlist"),
+                    }
+                )
                 return
 
             # Process the playlist
@@ -704,42 +1191,20 @@ async def generate_vibe_playlist_stream(
                     "message": f"Processing {len(finalized_playlist)} tracks...",
                     "data": {},
                 }
-                yield f"data: {json.dumps(finalizing_data)}\n\n"
+                yield _sse(finalizing_data)
 
                 # Load track info from database
-                db_path = os.path.join(os.path.dirname(__file__), "tracks.db")
-                conn = sqlite3.connect(db_path)
-                cursor = conn.cursor()
-
-                for item in finalized_playlist:
-                    filepath = item.get("filepath")
-                    if not filepath:
-                        continue
-
-                    cursor.execute(
-                        "SELECT * FROM tracks WHERE filepath = ?", (filepath,)
-                    )
-                    columns = [description[0] for description in cursor.description]
-                    row = cursor.fetchone()
-
-                    if row:
-                        track = dict(zip(columns, row))
-                        track_info = {
-                            "filename": track.get("filename", ""),
-                            "filepath": track.get("filepath", ""),
-                            "duration": track.get("duration", 0.0),
-                            "title": track.get("title"),
-                            "artist": track.get("artist"),
-                            "album": track.get("album"),
-                            "genre": track.get("genre"),
-                            "year": track.get("year"),
-                            "has_artwork": track.get("has_artwork", False),
-                            "bpm": track.get("bpm"),
-                        }
-                        playlist_tracks.append(track_info)
-
-                cursor.close()
-                conn.close()
+                filepaths = [
+                    item["filepath"]
+                    for item in finalized_playlist
+                    if item.get("filepath")
+                ]
+
+                playlist_tracks = [
+                    {field: track[field] for field in TRACK_INFO_FIELDS}
+                    for track in await get_tracks_from_db(filepaths)
+                    if track
+                ]
 
             # Send the final playlist
             final_response = {
@@ -757,12 +1222,18 @@ async def generate_vibe_playlist_stream(
                 "total_tracks_considered": 1000,
             }
 
-            yield f"data: {json.dumps(final_response)}\n\n"
+            yield _sse(final_response)
 
         finally:
             # Remove our handler
             dj_logger.removeHandler(queue_handler)
 
+            # Stop generation if the client disconnected before it finished
+            if generation_task is not None and not generation_task.done():
+                generation_task.cancel()
+            if next_log is not None and not next_log.done():
+                next_log.cancel()
+
     return StreamingResponse(
         event_generator(),
         media_type="text/event-stream",
@@ -780,7 +1251,7 @@ async def generate_vibe_playlist_stream(
 @app.get("/api/library/folders")
 async def get_music_folders():
     """Get all configured music folders."""
-    folders = music_library.get_music_folders()
+    folders = await asyncio.to_thread(music_library.get_music_folders)
     return {"folders": folders}
 
 
@@ -788,7 +1259,9 @@ async def get_music_folders():
 async def add_music_folder(request: MusicFolderRequest):
     """Add a new music folder to the library."""
     try:
-        folder_info = music_library.add_music_folder(request.path, request.auto_scan)
+        folder_info = await asyncio.to_thread(
+            music_library.add_music_folder, request.path, request.auto_scan
+        )
 
         # Auto-scan disabled - tracks are added to database but not analyzed
         folder_info["queued_tracks"] = 0
@@ -804,7 +1277,7 @@ async def add_music_folder(request: MusicFolderRequest):
 @app.delete("/api/library/folders/{folder_path:path}")
 async def remove_music_folder(folder_path: str):
     """Remove a music folder from the library."""
-    success = music_library.remove_music_folder(folder_path)
+    success = await asyncio.to_thread(music_library.remove_music_folder, folder_path)
     if not success:
         raise HTTPException(status_code=404, detail="Folder not found")
     return {"status": "removed", "path": folder_path}
@@ -813,7 +1286,7 @@ async def remove_music_folder(folder_path: str):
 @app.post("/api/library/scan/{folder_id}")
 async def scan_music_folder(folder_id: int, full_scan: bool = False):
     """Scan a music folder for new tracks."""
-    folders = music_library.get_music_folders()
+    folders = await asyncio.to_thread(music_library.get_music_folders)
     folder = next((f for f in folders if f["id"] == folder_id), None)
 
     if not folder:
@@ -822,17 +1295,20 @@ async def scan_music_folder(folder_id: int, full_scan: bool = False):
     if not folder["exists"]:
         raise HTTPException(status_code=400, detail="Folder does not exist")
 
-    # Get new tracks
-    new_tracks = music_library.get_new_tracks(folder["path"])
+    # Files may have moved or changed size since they were last resolved
+    locate_track.cache_clear()
+    _stat_cache.clear()
+
+    # Get new tracks, plus changed ones on a full scan
+    new_tracks = await asyncio.to_thread(
+        music_library.get_new_tracks, folder["path"], full_scan
+    )
 
     # Queue for analysis
-    queued = 0
-    for track in new_tracks:
-        await analysis_queue.add_track(track, priority=3)
-        queued += 1
+    queued = await analysis_queue.add_tracks_bulk(new_tracks, priority=3)
 
     # Update scan time
-    music_library.update_folder_scan_time(folder["path"])
+    await asyncio.to_thread(music_library.update_folder_scan_time, folder["path"])
 
     return {"folder": folder["path"], "new_tracks": len(new_tracks), "queued": queued}
 
@@ -840,22 +1316,27 @@ async def scan_music_folder(folder_id: int, full_scan: bool = False):
 @app.get("/api/library/stats")
 async def get_library_stats():
     """Get music library statistics."""
-    stats = music_library.get_library_stats()
+    stats = await asyncio.to_thread(music_library.get_library_stats)
     return stats
 
 
 @app.get("/api/library/settings")
 async def get_library_settings():
     """Get library settings."""
-    settings = music_library.get_settings()
+    settings = await asyncio.to_thread(music_library.get_settings)
     return settings
 
 
+def update_settings(settings: Dict[str, str]):
+    """Store each setting in turn."""
+    for key, value in settings.items():
+        music_library.update_setting(key, value)
+
+
 @app.put("/api/library/settings")
 async def update_library_settings(settings: Dict[str, str]):
     """Update library settings."""
-    for key, value in settings.items():
-        music_library.update_setting(key, value)
+    await asyncio.to_thread(update_settings, settings)
     return {"status": "updated", "settings": settings}
 
 
@@ -874,13 +1355,23 @@ async def retry_failed_analysis(max_retries: int = 3):
 
 
 @app.post("/api/library/analysis/metadata-scan")
-async def fast_metadata_scan(background_tasks: BackgroundTasks):
+async def fast_metadata_scan():
     """Fast metadata-only scan for tracks missing basic metadata.
 
     This is much faster than full analysis as it only reads file tags.
     """
+    global _metadata_scan
+    if _metadata_scan is not None and not _metadata_scan.done():
+        return {
+            "status": "scanning",
+            "message": "A metadata scan is already running",
+            "tracks_to_scan": 0,
+        }
+
     # Get tracks needing metadata
-    tracks_needing_metadata = music_library.get_tracks_needing_metadata()
+    tracks_needing_metadata = await asyncio.to_thread(
+        music_library.get_tracks_needing_metadata
+    )
 
     if not tracks_needing_metadata:
         return {
@@ -889,10 +1380,11 @@ async def fast_metadata_scan(background_tasks: BackgroundTasks):
             "scanned_tracks": 0,
         }
 
-    # Run metadata analysis in background
-    background_tasks.add_task(
+    # Run on the dedicated scan thread, not the request threadpool
+    _metadata_scan = get_metadata_scan_executor().submit(
         metadata_analyzer.batch_analyze_metadata, tracks_needing_metadata
     )
+    _metadata_scan.add_done_callback(log_metadata_scan_failure)
 
     return {
         "status": "scanning",
@@ -901,6 +1393,20 @@ async def fast_metadata_scan(background_tasks: BackgroundTasks):
     }
 
 
+def reset_analysis_status():
+    """Mark every track pending so a full reanalysis picks it up."""
+    with db_pool.acquire() as conn, conn:
+        conn.execute(
+            "UPDATE tracks SET analysis_status = 'pending', analysis_version = 1"
+        )
+
+
+def all_track_paths() -> List[str]:
+    """Filepath of every track in the library."""
+    with db_pool.acquire() as conn:
+        return [row[0] for row in conn.execute("SELECT filepath FROM tracks")]
+
+
 @app.post("/api/library/analysis/reprocess-all")
 async def reprocess_all_tracks(
     force_reanalyze: bool = False, metadata_only: bool = False
@@ -913,41 +1419,27 @@ async def reprocess_all_tracks(
     """
     if force_reanalyze:
         # Reset all tracks to pending for full reanalysis
-        conn = sqlite3.connect(db_path)
-        cursor = conn.cursor()
-        cursor.execute(
-            'UPDATE tracks SET analysis_status = "pending", analysis_version = 1'
-        )
-        conn.commit()
-        conn.close()
+        await asyncio.to_thread(reset_analysis_status)
 
         # Get all tracks
-        tracks = music_library.get_all_tracks()
-        queued_count = 0
-
-        for track in tracks:
-            await analysis_queue.add_track(track["filepath"], priority=3)
-            queued_count += 1
+        tracks = await asyncio.to_thread(all_track_paths)
+        queued_count = await analysis_queue.add_tracks_bulk(tracks, priority=3)
     else:
         # Smart filtering based on what's actually needed
         if metadata_only:
             # Only get tracks missing essential metadata
-            tracks_to_analyze = music_library.get_tracks_needing_metadata()
+            tracks_to_analyze = await asyncio.to_thread(
+                music_library.get_tracks_needing_metadata
+            )
         else:
             # Get tracks needing any analysis (basic or enhanced)
-            tracks_needing_basic = music_library.get_tracks_needing_metadata()
-            tracks_needing_enhanced = (
-                music_library.get_tracks_missing_enhanced_metadata()
-            )
-            # Combine and deduplicate
-            tracks_to_analyze = list(
-                set(tracks_needing_basic + tracks_needing_enhanced)
+            tracks_to_analyze = await asyncio.to_thread(
+                music_library.get_tracks_needing_any_analysis
             )
 
-        queued_count = 0
-        for filepath in tracks_to_analyze:
-            await analysis_queue.add_track(filepath, priority=3)
-            queued_count += 1
+        queued_count = await analysis_queue.add_tracks_bulk(
+            tracks_to_analyze, priority=3
+        )
 
     return {
         "status": "reprocessing",
@@ -960,7 +1452,7 @@ async def reprocess_all_tracks(
 @app.post("/api/library/first-run-complete")
 async def mark_first_run_complete():
     """Mark that first-run setup is complete."""
-    music_library.mark_first_run_complete()
+    await asyncio.to_thread(music_library.mark_first_run_complete)
     # Start the analysis queue with enhanced analyzer
     await analysis_queue.start(enhanced_analyzer)
     return {"status": "complete"}
@@ -969,6 +1461,28 @@ async def mark_first_run_complete():
 # WebSocket endpoint removed - using periodic HTTP polling instead
 
 if __name__ == "__main__":
+    import importlib.machinery
+
     import uvicorn
 
-    uvicorn.run("main:app", host="127.0.0.1", port=8000, reload=True)
+    # Analysis pool workers re-run the launching script as __mp_main__ unless
+    # it looks like a module entry point; this file builds the whole app, so
+    # mark it as one and workers only import utils.librosa
+    __spec__ = importlib.machinery.ModuleSpec("__main__", None)
+
+    # Set DEV=1 for auto-reload; WORKERS>1 forks extra processes, but the
+    # analysis queue and caches are per-process and SQLite has one writer.
+    # Set ANALYZE_ON_STARTUP=1 to queue unanalyzed tracks at boot.
+    # Per-request access lines are only written in DEV mode.
+    dev = os.environ.get("DEV") == "1"
+    uvicorn.run(
+        "main:app",
+        host="127.0.0.1",
+        port=8000,
+        loop="uvloop",
+        http="httptools",
+        workers=int(os.environ.get("WORKERS", 1)),
+        reload=dev,
+        log_level=os.environ.get("LOG_LEVEL", "INFO").lower(),
+        access_log=dev,
+    )
@@ -0,0 +1,12 @@
+-- Migration: Remember batch BPM results across restarts
+-- /tracks/batch-analyze runs beat tracking on raw files, which may not be in
+-- the tracks table. Results are keyed by the file's absolute path and only
+-- reused while its size and mtime still match, so edited files are
+-- re-analyzed.
+
+CREATE TABLE IF NOT EXISTS bpm_cache (
+    filepath TEXT PRIMARY KEY,
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    bpm REAL NOT NULL
+);
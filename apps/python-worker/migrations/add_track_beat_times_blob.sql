@@ -0,0 +1,13 @@
+-- Migration: Store beat times as packed float32 blobs
+-- tracks.beat_times holds a JSON array (~8 KB per track) that has to be
+-- re-parsed on every analysis request. The same values as little-endian
+-- float32 take 4 bytes per beat and decode with a single np.frombuffer.
+-- They live in a side table so `SELECT * FROM tracks` callers, which
+-- serialize whole rows to JSON, never see a binary column.
+
+CREATE TABLE IF NOT EXISTS track_beat_times (
+    filepath TEXT PRIMARY KEY,
+    beat_times BLOB NOT NULL
+);
+
+-- Existing JSON rows are re-encoded by the migration runner
@@ -0,0 +1,24 @@
+-- Migration: Drop packed beat times when tracks.beat_times is rewritten
+-- The analysis endpoint prefers track_beat_times over the JSON column, but
+-- scripts (analyze_and_enhance_tracks_sql.py, migrate_mongo_to_sql.py) and
+-- the SQLite adapter only write tracks.beat_times. Removing the packed copy
+-- whenever a row's beat grid changes makes reads fall back to the current
+-- JSON until a writer that packs (EnhancedTrackAnalyzer) stores a new one.
+
+CREATE TRIGGER IF NOT EXISTS trg_tracks_beat_times_insert
+AFTER INSERT ON tracks
+BEGIN
+    DELETE FROM track_beat_times WHERE filepath = NEW.filepath;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_tracks_beat_times_update
+AFTER UPDATE OF beat_times, filepath ON tracks
+BEGIN
+    DELETE FROM track_beat_times WHERE filepath IN (OLD.filepath, NEW.filepath);
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_tracks_beat_times_delete
+AFTER DELETE ON tracks
+BEGIN
+    DELETE FROM track_beat_times WHERE filepath = OLD.filepath;
+END;
@@ -0,0 +1,5 @@
+-- Migration: Index tracks by BPM for vibe searches
+-- search_tracks_by_vibe filters on a BPM range; with this index SQLite seeks
+-- into the range instead of scanning every track.
+
+CREATE INDEX IF NOT EXISTS idx_bpm ON tracks(bpm);
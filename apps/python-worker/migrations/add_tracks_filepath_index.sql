@@ -0,0 +1,11 @@
+-- Migration: Make tracks.filepath lookups an index seek and collect planner statistics
+-- Every track lookup filters on filepath (= ? and IN (...)).
+
+-- tracks.filepath is normally declared UNIQUE, which already gives SQLite an
+-- automatic index; idx_filepath then only duplicates it and slows writes.
+-- The migration runner checks for that automatic index before dropping, and
+-- creates idx_tracks_filepath instead on databases that lack one.
+DROP INDEX IF EXISTS idx_filepath;
+
+-- Gather statistics so the planner picks the filepath index for IN (...) too
+ANALYZE;
@@ -0,0 +1,7 @@
+-- Migration: Serve the /tracks listing in index order
+-- SQL_LIST_TRACKS orders by (artist, album, title); with a matching index
+-- SQLite walks the index instead of sorting the whole table on every read.
+
+CREATE INDEX IF NOT EXISTS idx_tracks_artist_album_title ON tracks(artist, album, title);
+
+ANALYZE;
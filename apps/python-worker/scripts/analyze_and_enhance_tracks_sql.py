@@ -143,7 +143,7 @@ class TrackDatabase:
                 f.seek(-8192, 2)
                 end = f.read(8192)
                 return hashlib.md5(start + end).hexdigest()
-        except:
+        except OSError:
             return ""
 
     def needs_analysis(self, file_path: str) -> bool:
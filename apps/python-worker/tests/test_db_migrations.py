@@ -0,0 +1,131 @@
+"""Tests for the database migration runner."""
+
+import os
+import sqlite3
+import tempfile
+
+import pytest
+
+from utils.db_migrations import MigrationRunner, run_migrations
+
+
+class TestMigrationRunner:
+    """Test that migrations apply cleanly to fresh and existing databases."""
+
+    @pytest.fixture
+    def db_path(self):
+        """Path to an empty temporary database."""
+        with tempfile.NamedTemporaryFile(suffix=".db", delete=False) as f:
+            db_path = f.name
+
+        yield db_path
+
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(db_path + suffix):
+                os.unlink(db_path + suffix)
+
+    def applied(self, db_path):
+        return set(MigrationRunner(db_path).get_applied_migrations())
+
+    def test_empty_database(self, db_path):
+        """All migrations run against a database without a tracks table."""
+        run_migrations(db_path)
+
+        conn = sqlite3.connect(db_path)
+        tables = {
+            row[0]
+            for row in conn.execute(
+                "SELECT name FROM sqlite_master WHERE type = 'table'"
+            )
+        }
+        conn.close()
+
+        assert {"track_beat_times", "bpm_cache", "settings"} <= tables
+        assert "add_track_beat_times_blob.sql" in self.applied(db_path)
+        assert "add_tracks_bpm_index.sql" not in self.applied(db_path)
+
+        # Running again is a no-op rather than an error
+        run_migrations(db_path)
+
+    def test_deferred_indexes_apply_once_tracks_exists(self, db_path):
+        """Track index migrations run on the first pass after tracks is created."""
+        run_migrations(db_path)
+
+        conn = sqlite3.connect(db_path)
+        conn.execute(
+            "CREATE TABLE tracks (id INTEGER PRIMARY KEY, filepath TEXT, "
+            "artist TEXT, album TEXT, title TEXT, bpm REAL, beat_times TEXT)"
+        )
+        conn.commit()
+        conn.close()
+
+        run_migrations(db_path)
+
+        conn = sqlite3.connect(db_path)
+        indexes = {
+            row[0]
+            for row in conn.execute(
+                "SELECT name FROM sqlite_master WHERE type = 'index' "
+                "AND tbl_name = 'tracks'"
+            )
+        }
+        conn.close()
+
+        assert {"idx_bpm", "idx_tracks_artist_album_title"} <= indexes
+        assert "add_tracks_bpm_index.sql" in self.applied(db_path)
+
+    def test_backfills_existing_beat_times(self, db_path):
+        """JSON beat times already in tracks are copied into the blob table."""
+        conn = sqlite3.connect(db_path)
+        conn.execute(
+            "CREATE TABLE tracks (id INTEGER PRIMARY KEY, filepath TEXT UNIQUE, "
+            "artist TEXT, album TEXT, title TEXT, bpm REAL, beat_times TEXT)"
+        )
+        conn.execute(
+            "INSERT INTO tracks (filepath, beat_times) VALUES ('a.mp3', '[0.5, 1.0]')"
+        )
+        conn.commit()
+        conn.close()
+
+        run_migrations(db_path)
+
+        conn = sqlite3.connect(db_path)
+        count = conn.execute("SELECT COUNT(*) FROM track_beat_times").fetchone()[0]
+        conn.close()
+
+        assert count == 1
+
+    def test_rewritten_beat_times_drop_packed_copy(self, db_path):
+        """Writers that only touch tracks.beat_times can't leave a stale blob."""
+        conn = sqlite3.connect(db_path)
+        conn.execute(
+            "CREATE TABLE tracks (id INTEGER PRIMARY KEY, filepath TEXT UNIQUE, "
+            "artist TEXT, album TEXT, title TEXT, bpm REAL, beat_times TEXT)"
+        )
+        conn.executemany(
+            "INSERT INTO tracks (filepath, beat_times) VALUES (?, '[0.5, 1.0]')",
+            [("a.mp3",), ("b.mp3",), ("c.mp3",)],
+        )
+        conn.commit()
+        conn.close()
+
+        run_migrations(db_path)
+
+        conn = sqlite3.connect(db_path)
+        # As scripts/analyze_and_enhance_tracks_sql.py save_track does
+        conn.execute(
+            "INSERT OR REPLACE INTO tracks (filepath, beat_times) "
+            "VALUES ('a.mp3', '[0.25]')"
+        )
+        conn.execute("UPDATE tracks SET beat_times = '[0.75]' WHERE filepath = 'b.mp3'")
+        conn.execute("UPDATE tracks SET bpm = 120 WHERE filepath = 'c.mp3'")
+        conn.commit()
+        packed = [
+            row[0]
+            for row in conn.execute(
+                "SELECT filepath FROM track_beat_times ORDER BY filepath"
+            )
+        ]
+        conn.close()
+
+        assert packed == ["c.mp3"]
@@ -0,0 +1,42 @@
+"""Tests for the enhanced track analyzer's structure segmentation."""
+
+import librosa
+import numpy as np
+import pytest
+
+from utils.enhanced_analyzer import EnhancedTrackAnalyzer
+
+
+class TestAnalyzeStructure:
+    """Per-segment means computed from agglomerative bounds."""
+
+    @pytest.fixture
+    def signal(self):
+        rng = np.random.default_rng(0)
+        return rng.standard_normal(22050 * 4).astype(np.float32), 22050
+
+    def test_repeated_bounds(self, signal, monkeypatch):
+        """A zero-length segment has no energy instead of a bogus one."""
+        y, sr = signal
+        bounds = np.array([0, 20, 20, 60, 60, 60, 120])
+        monkeypatch.setattr(librosa.segment, "agglomerative", lambda data, k: bounds)
+
+        structure = EnhancedTrackAnalyzer(":memory:")._analyze_structure(
+            y, sr, 120.0
+        )
+        energies = [segment["energy"] for segment in structure["segments"]]
+
+        # Expected means use the same time -> frame round trip as the analyzer
+        centroids = librosa.feature.spectral_centroid(y=y, sr=sr, hop_length=512)[0]
+        frames = (librosa.frames_to_time(bounds, sr=sr) * sr / 512).astype(int)
+        expected = [
+            centroids[start:end].mean()
+            for start, end in zip(frames[:-1], frames[1:])
+            if end > start
+        ]
+
+        assert structure["total_segments"] == 6
+        assert np.isnan([energies[1], energies[3], energies[4]]).all()
+        np.testing.assert_allclose(
+            [energies[0], energies[2], energies[5]], expected, rtol=1e-5
+        )
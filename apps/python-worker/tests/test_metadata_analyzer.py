@@ -0,0 +1,127 @@
+"""Tests for the metadata-only batch scan."""
+
+import os
+import shutil
+import sqlite3
+import tempfile
+import threading
+import time
+
+import numpy as np
+import pytest
+import soundfile as sf
+
+from utils.metadata_analyzer import MetadataAnalyzer
+
+
+class TestBatchAnalyzeMetadata:
+    """Test which files a metadata scan reads and what it stores."""
+
+    @pytest.fixture
+    def temp_db(self):
+        """Create a temporary database with the columns the scan writes."""
+        with tempfile.NamedTemporaryFile(suffix=".db", delete=False) as f:
+            db_path = f.name
+
+        conn = sqlite3.connect(db_path)
+        conn.execute("""
+            CREATE TABLE tracks (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                filepath TEXT UNIQUE NOT NULL,
+                filename TEXT NOT NULL,
+                file_size INTEGER,
+                last_modified REAL,
+                title TEXT,
+                artist TEXT,
+                album TEXT,
+                genre TEXT,
+                year TEXT,
+                albumartist TEXT,
+                track TEXT,
+                duration REAL,
+                has_artwork BOOLEAN DEFAULT 0,
+                analysis_status TEXT DEFAULT 'pending'
+            )
+        """)
+        conn.commit()
+        conn.close()
+
+        yield db_path
+
+        os.unlink(db_path)
+
+    @pytest.fixture
+    def audio_files(self):
+        """Three short WAV files of different lengths."""
+        folder = tempfile.mkdtemp()
+        paths = []
+        for i, seconds in enumerate([1.0, 2.0, 3.0]):
+            path = os.path.join(folder, f"track{i}.wav")
+            sf.write(path, np.zeros(int(8000 * seconds)), 8000)
+            paths.append(path)
+
+        yield paths
+
+        shutil.rmtree(folder)
+
+    @pytest.fixture
+    def analyzer(self, temp_db, monkeypatch):
+        """A MetadataAnalyzer that records which files it reads tags from."""
+        analyzer = MetadataAnalyzer(temp_db)
+        analyzer.reads = []
+        read_tags = analyzer.analyze_metadata_only
+
+        def recording_read(filepath):
+            analyzer.reads.append(filepath)
+            return read_tags(filepath)
+
+        monkeypatch.setattr(analyzer, "analyze_metadata_only", recording_read)
+        return analyzer
+
+    def stored(self, db_path):
+        conn = sqlite3.connect(db_path)
+        rows = conn.execute(
+            "SELECT filepath, duration FROM tracks ORDER BY id"
+        ).fetchall()
+        conn.close()
+        return rows
+
+    def test_unchanged_files_are_skipped(self, analyzer, audio_files):
+        """A second scan only re-reads files whose size or mtime changed."""
+        assert analyzer.batch_analyze_metadata(audio_files) == 3
+
+        analyzer.reads.clear()
+        assert analyzer.batch_analyze_metadata(audio_files) == 0
+        assert analyzer.reads == []
+
+        sf.write(audio_files[1], np.zeros(8000 * 5), 8000)
+        assert analyzer.batch_analyze_metadata(audio_files) == 1
+        assert analyzer.reads == [audio_files[1]]
+        assert self.stored(analyzer.db_path)[1] == (audio_files[1], 5.0)
+
+    def test_concurrent_reads_keep_input_order(self, analyzer, audio_files):
+        """Tags are read in parallel but stored in the order files were given."""
+        read_tags = analyzer.analyze_metadata_only
+        lock = threading.Lock()
+        active = [0]
+        peak = [0]
+
+        def slow_read(filepath):
+            # Earlier files finish last, so completion order is reversed
+            with lock:
+                active[0] += 1
+                peak[0] = max(peak[0], active[0])
+            time.sleep(0.05 * (len(audio_files) - audio_files.index(filepath)))
+            with lock:
+                active[0] -= 1
+            return read_tags(filepath)
+
+        analyzer.analyze_metadata_only = slow_read
+        assert analyzer.batch_analyze_metadata(audio_files) == 3
+
+        assert peak[0] > 1
+        assert self.stored(analyzer.db_path) == [
+            (audio_files[0], 1.0),
+            (audio_files[1], 2.0),
+            (audio_files[2], 3.0),
+        ]
@@ -6,10 +6,15 @@ import tempfile
 import shutil
 import sqlite3
 import asyncio
+import threading
 from unittest.mock import Mock, AsyncMock
 
+import numpy as np
+import soundfile as sf
+
 from utils.music_library import MusicLibraryManager
 from utils.analysis_queue import AnalysisQueue
+from utils.enhanced_analyzer import EnhancedTrackAnalyzer
 from utils.file_watcher import MusicFolderWatcher, MusicFileHandler
 
 
@@ -166,6 +171,76 @@ class TestMusicLibraryManager:
         new_tracks = music_library.get_new_tracks(temp_music_folder)
         assert len(new_tracks) == 2
 
+    def test_get_changed_tracks(self, music_library, temp_music_folder):
+        """Test that a full scan also returns files changed on disk."""
+        conn = sqlite3.connect(music_library.db_path)
+        conn.execute("ALTER TABLE tracks ADD COLUMN last_modified REAL")
+        for filename in ["test1.mp3", "test2.mp3", "test3.wav"]:
+            filepath = os.path.join(temp_music_folder, filename)
+            st = os.stat(filepath)
+            conn.execute(
+                """
+                INSERT INTO tracks (filename, filepath, file_size, last_modified)
+                VALUES (?, ?, ?, ?)
+            """,
+                (filename, os.path.relpath(filepath), st.st_size, st.st_mtime),
+            )
+        conn.commit()
+        conn.close()
+
+        assert music_library.get_new_tracks(temp_music_folder, True) == []
+
+        # Rewrite one file with different contents
+        changed = os.path.join(temp_music_folder, "test2.mp3")
+        with open(changed, "wb") as f:
+            f.write(b"re-encoded fake audio data")
+
+        assert music_library.get_new_tracks(temp_music_folder) == []
+        assert music_library.get_new_tracks(temp_music_folder, True) == [changed]
+
+    @pytest.mark.asyncio
+    async def test_analysis_records_scan_signature(self, music_library, temp_db):
+        """A full scan doesn't re-queue a file analyzed since it changed."""
+        conn = sqlite3.connect(temp_db)
+        for column in [
+            "last_modified REAL",
+            "key TEXT",
+            "key_scale TEXT",
+            "key_confidence REAL",
+            "camelot_key TEXT",
+            "energy_profile TEXT",
+            "structure TEXT",
+            "hot_cues TEXT",
+            "analyzed_at TIMESTAMP",
+        ]:
+            conn.execute(f"ALTER TABLE tracks ADD COLUMN {column}")
+        conn.execute(
+            "CREATE TABLE track_beat_times (filepath TEXT PRIMARY KEY, beat_times BLOB)"
+        )
+        conn.commit()
+        conn.close()
+
+        folder = tempfile.mkdtemp()
+        track = os.path.join(folder, "tone.wav")
+        sr = 22050
+        t = np.arange(sr * 3) / sr
+        sf.write(track, 0.5 * np.sin(2 * np.pi * 440 * t), sr)
+        analyzer = EnhancedTrackAnalyzer(temp_db)
+
+        try:
+            # New file: scan, analyze (inserts the row), scan
+            assert music_library.get_new_tracks(folder, True) == [track]
+            assert await analyzer.analyze_file(track)
+            assert music_library.get_new_tracks(folder, True) == []
+
+            # Changed file: scan, analyze (updates the row), scan
+            sf.write(track, 0.5 * np.sin(2 * np.pi * 220 * t), sr, subtype="FLOAT")
+            assert music_library.get_new_tracks(folder, True) == [track]
+            assert await analyzer.analyze_file(track)
+            assert music_library.get_new_tracks(folder, True) == []
+        finally:
+            shutil.rmtree(folder)
+
     def test_settings_management(self, music_library):
         """Test settings get/update."""
         # Default should be empty
@@ -224,6 +299,26 @@ class TestMusicLibraryManager:
         assert stats["active_folders"] == 1
         assert stats["total_size_mb"] == 0.0  # file_size not in our test data
 
+    def test_connection_reused_per_thread(self, music_library):
+        """Calls on one thread share a connection; other threads get their own."""
+        with music_library._connect() as first:
+            pass
+        music_library.get_settings()
+        with music_library._connect() as second:
+            pass
+        assert first is second
+
+        other = []
+
+        def grab():
+            with music_library._connect() as conn:
+                other.append(conn)
+
+        thread = threading.Thread(target=grab)
+        thread.start()
+        thread.join()
+        assert other[0] is not first
+
 
 class TestAnalysisQueue:
     """Test analysis queue functionality."""
@@ -288,6 +383,26 @@ class TestAnalysisQueue:
         assert row[2] == 3  # priority
         assert row[3] == "pending"  # status
 
+    @pytest.mark.asyncio
+    async def test_add_tracks_bulk(self, analysis_queue):
+        """Test adding many tracks in batched transactions."""
+        filepaths = [f"/path/to/track{i}.mp3" for i in range(1200)]
+
+        queued = await analysis_queue.add_tracks_bulk(filepaths, priority=3)
+
+        assert queued == 1200
+        assert analysis_queue.queue.qsize() == 1200
+
+        conn = sqlite3.connect(analysis_queue.db_path)
+        cursor = conn.cursor()
+        cursor.execute(
+            "SELECT COUNT(*) FROM analysis_queue WHERE priority = 3 AND status = 'pending'"
+        )
+        count = cursor.fetchone()[0]
+        conn.close()
+
+        assert count == 1200
+
     @pytest.mark.asyncio
     async def test_get_status(self, analysis_queue, temp_db):
         """Test getting queue status."""
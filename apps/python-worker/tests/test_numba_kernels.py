@@ -0,0 +1,47 @@
+"""Tests for the numba analysis kernels."""
+
+import librosa
+import numpy as np
+import pytest
+
+from utils.numba_kernels import rms, to_mono
+
+
+class TestRMS:
+    """The RMS kernel must agree with librosa's reference implementation."""
+
+    @pytest.mark.parametrize("n_samples", [1000, 22050 * 3 + 17])
+    def test_matches_librosa(self, n_samples):
+        """Frame count and values match librosa.feature.rms defaults."""
+        rng = np.random.default_rng(0)
+        y = (rng.standard_normal(n_samples) * 0.3).astype(np.float32)
+
+        expected = librosa.feature.rms(y=y)[0]
+        actual = rms(y)
+
+        assert actual.shape == expected.shape
+        np.testing.assert_allclose(actual, expected, rtol=1e-5, atol=1e-6)
+
+    def test_custom_hop(self):
+        """Non-default frame and hop lengths are honored."""
+        y = np.ones(10000, dtype=np.float32)
+
+        expected = librosa.feature.rms(y=y, frame_length=1024, hop_length=256)[0]
+        actual = rms(y, frame_length=1024, hop_length=256)
+
+        np.testing.assert_allclose(actual, expected, rtol=1e-5)
+
+
+class TestToMono:
+    """The downmix kernel must agree with averaging channels in NumPy."""
+
+    @pytest.mark.parametrize("n_channels", [1, 2, 6])
+    def test_matches_mean(self, n_channels):
+        """Output equals frames.mean(axis=1) exactly."""
+        rng = np.random.default_rng(0)
+        frames = rng.standard_normal((5000, n_channels)).astype(np.float32)
+
+        actual = to_mono(frames)
+
+        assert actual.dtype == np.float32
+        np.testing.assert_array_equal(actual, frames.mean(axis=1))
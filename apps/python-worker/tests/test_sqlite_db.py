@@ -0,0 +1,67 @@
+"""Tests for the MongoDB-style SQLite adapter used by the DJ agent."""
+
+import os
+import sqlite3
+import tempfile
+import threading
+
+import pytest
+
+from utils.sqlite_db import SQLiteDatabase
+
+
+class TestSQLiteAdapter:
+    """Test that the shared adapter is safe to use from several threads."""
+
+    @pytest.fixture
+    def db(self):
+        """A database over a temporary file with one track."""
+        with tempfile.NamedTemporaryFile(suffix=".db", delete=False) as f:
+            db_path = f.name
+
+        conn = sqlite3.connect(db_path)
+        conn.execute(
+            "CREATE TABLE tracks (id INTEGER PRIMARY KEY, filepath TEXT, "
+            "bpm REAL, beat_times TEXT, energy_level REAL)"
+        )
+        conn.execute("INSERT INTO tracks (filepath, bpm) VALUES ('a.mp3', 120)")
+        conn.commit()
+        conn.close()
+
+        yield SQLiteDatabase(db_path)
+
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(db_path + suffix):
+                os.unlink(db_path + suffix)
+
+    def test_connection_per_thread(self, db):
+        """Each thread reuses its own connection and never sees another's."""
+        adapter = db.adapter
+        seen = []
+        thread = threading.Thread(target=lambda: seen.append(adapter.connection))
+        thread.start()
+        thread.join()
+
+        assert adapter.connection is adapter.connection
+        assert seen[0] is not adapter.connection
+
+    def test_concurrent_rating_inserts(self, db):
+        """Writes from several threads each commit exactly once."""
+
+        def rate(i):
+            for j in range(20):
+                db.transition_ratings.insert_one(
+                    {"from_track": f"t{i}", "to_track": f"u{j}", "rating": 0.5}
+                )
+
+        threads = [threading.Thread(target=rate, args=(i,)) for i in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        count = db.adapter.connection.execute(
+            "SELECT COUNT(*) FROM transition_ratings"
+        ).fetchone()[0]
+        assert count == 80
+        assert db.tracks.find_one({"filepath": "a.mp3"})["bpm"] == 120
@@ -0,0 +1,108 @@
+"""Tests for the SQLite connection pool."""
+
+import os
+import sqlite3
+import tempfile
+import threading
+
+import pytest
+
+from utils.sqlite_pool import SQLitePool
+
+
+class TestSQLitePool:
+    """Test connection reuse and transaction hygiene."""
+
+    @pytest.fixture
+    def temp_db(self):
+        """Create a temporary database with a tracks table."""
+        with tempfile.NamedTemporaryFile(suffix=".db", delete=False) as f:
+            db_path = f.name
+
+        conn = sqlite3.connect(db_path)
+        conn.execute(
+            "CREATE TABLE tracks (id INTEGER PRIMARY KEY, filepath TEXT UNIQUE)"
+        )
+        conn.execute("INSERT INTO tracks (filepath) VALUES ('a.mp3')")
+        conn.commit()
+        conn.close()
+
+        yield db_path
+
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(db_path + suffix):
+                os.unlink(db_path + suffix)
+
+    def test_connections_are_reused(self, temp_db):
+        """A released connection is handed to the next caller."""
+        pool = SQLitePool(temp_db, size=2)
+
+        with pool.acquire() as first:
+            pass
+        with pool.acquire() as second:
+            pass
+
+        assert first is second
+        pool.close()
+
+    def test_rows_and_wal_mode(self, temp_db):
+        """Pooled connections return Row objects and run in WAL mode."""
+        pool = SQLitePool(temp_db)
+
+        with pool.acquire() as conn:
+            row = conn.execute("SELECT filepath FROM tracks").fetchone()
+            journal_mode = conn.execute("PRAGMA journal_mode").fetchone()[0]
+            cache_size = conn.execute("PRAGMA cache_size").fetchone()[0]
+            temp_store = conn.execute("PRAGMA temp_store").fetchone()[0]
+
+        assert row["filepath"] == "a.mp3"
+        assert journal_mode == "wal"
+        assert cache_size == -131072
+        assert temp_store == 2  # MEMORY
+        pool.close()
+
+    def test_uncommitted_writes_are_rolled_back(self, temp_db):
+        """A connection never returns to the pool mid-transaction."""
+        pool = SQLitePool(temp_db, size=1)
+
+        with pool.acquire() as conn:
+            conn.execute("INSERT INTO tracks (filepath) VALUES ('b.mp3')")
+
+        with pool.acquire() as conn:
+            assert not conn.in_transaction
+            count = conn.execute("SELECT COUNT(*) FROM tracks").fetchone()[0]
+
+        assert count == 1
+        pool.close()
+
+    def test_pool_size_is_bounded(self, temp_db):
+        """Callers wait for a free connection once the pool is exhausted."""
+        pool = SQLitePool(temp_db, size=1)
+        seen = []
+
+        def worker():
+            with pool.acquire() as conn:
+                seen.append(conn)
+
+        with pool.acquire() as held:
+            thread = threading.Thread(target=worker)
+            thread.start()
+            thread.join(timeout=0.2)
+            assert thread.is_alive()
+
+        thread.join(timeout=2)
+        assert seen == [held]
+        pool.close()
+
+    def test_checkout_times_out(self, temp_db):
+        """Waiting for a connection gives up after the pool timeout."""
+        pool = SQLitePool(temp_db, size=1, timeout=0.05)
+
+        with pool.acquire():
+            with pytest.raises(sqlite3.OperationalError):
+                with pool.acquire():
+                    pass
+
+        with pool.acquire() as conn:
+            assert conn.execute("SELECT COUNT(*) FROM tracks").fetchone()[0] == 1
+        pool.close()
@@ -0,0 +1,77 @@
+"""Tests for byte-range handling in the audio streaming endpoint."""
+
+import os
+import tempfile
+
+import pytest
+from fastapi.testclient import TestClient
+
+import main
+
+
+class TestStreamRanges:
+    """Test partial content responses for seeking."""
+
+    @pytest.fixture
+    def audio_path(self):
+        """A 3000-byte file with an audio extension."""
+        with tempfile.NamedTemporaryFile(suffix=".mp3", delete=False) as f:
+            f.write(bytes(range(250)) * 12)
+            path = f.name
+
+        yield path
+
+        os.unlink(path)
+        main.locate_track.cache_clear()
+
+    @pytest.fixture
+    def client(self):
+        return TestClient(main.app)
+
+    def get_range(self, client, path, byte_range):
+        return client.get(f"/track/{path}/stream", headers={"Range": byte_range})
+
+    def test_range_within_file(self, client, audio_path):
+        """A satisfiable range returns exactly the requested bytes."""
+        response = self.get_range(client, audio_path, "bytes=100-199")
+
+        assert response.status_code == 206
+        assert response.headers["content-range"] == "bytes 100-199/3000"
+        assert response.content == (bytes(range(250)) * 12)[100:200]
+
+    def test_open_ended_range_is_clamped(self, client, audio_path):
+        """A range running past the end stops at the last byte."""
+        response = self.get_range(client, audio_path, "bytes=2500-9999")
+
+        assert response.status_code == 206
+        assert response.headers["content-range"] == "bytes 2500-2999/3000"
+        assert response.headers["content-length"] == "500"
+        assert len(response.content) == 500
+
+    @pytest.mark.parametrize("byte_range", ["bytes=5000-", "bytes=3000-3100"])
+    def test_range_past_end_is_unsatisfiable(self, client, audio_path, byte_range):
+        """A range starting at or past the end of the file gets a 416."""
+        response = self.get_range(client, audio_path, byte_range)
+
+        assert response.status_code == 416
+        assert response.headers["content-range"] == "bytes */3000"
+
+    def test_reversed_range_is_unsatisfiable(self, client, audio_path):
+        """A range whose end precedes its start gets a 416."""
+        response = self.get_range(client, audio_path, "bytes=200-100")
+
+        assert response.status_code == 416
+        assert response.headers["content-range"] == "bytes */3000"
+
+    def test_file_rewritten_in_place(self, client, audio_path):
+        """Headers follow the file on disk, not a stat cached before it shrank."""
+        self.get_range(client, audio_path, "bytes=0-99")
+        with open(audio_path, "r+b") as f:
+            f.truncate(1000)
+
+        response = self.get_range(client, audio_path, "bytes=500-")
+
+        assert response.status_code == 206
+        assert response.headers["content-range"] == "bytes 500-999/1000"
+        assert response.headers["content-length"] == "500"
+        assert len(response.content) == 500
@@ -0,0 +1,183 @@
+"""Tests for the track listing and batch BPM endpoints."""
+
+import gzip
+import os
+import sqlite3
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+
+import orjson
+import pytest
+from fastapi.testclient import TestClient
+
+import main
+from utils.db_migrations import run_migrations
+from utils.sqlite_pool import SQLitePool
+
+
+@pytest.fixture
+def library_db(monkeypatch):
+    """Point the app at a migrated temporary database with three tracks."""
+    with tempfile.NamedTemporaryFile(suffix=".db", delete=False) as f:
+        db_path = f.name
+
+    conn = sqlite3.connect(db_path)
+    conn.execute("""
+        CREATE TABLE tracks (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            filepath TEXT UNIQUE NOT NULL,
+            filename TEXT NOT NULL,
+            duration REAL,
+            title TEXT,
+            artist TEXT,
+            album TEXT,
+            genre TEXT,
+            year TEXT,
+            has_artwork BOOLEAN DEFAULT FALSE,
+            bpm REAL,
+            beat_times TEXT,
+            energy_level REAL
+        )
+    """)
+    conn.executemany(
+        "INSERT INTO tracks (filepath, filename, title, artist, bpm) "
+        "VALUES (?, ?, ?, ?, ?)",
+        [
+            ("a.mp3", "a.mp3", "A", "Artist 1", 120.0),
+            ("b.mp3", "b.mp3", "B", "Artist 2", None),
+            ("c.mp3", "c.mp3", "C", "Artist 3", 128.0),
+        ],
+    )
+    conn.commit()
+    conn.close()
+    run_migrations(db_path)
+
+    # Read once up front, as startup does, so the WAL file being created
+    # doesn't change the database version between requests
+    pool = SQLitePool(db_path)
+    with pool.acquire() as conn:
+        conn.execute("SELECT COUNT(*) FROM tracks").fetchone()
+    monkeypatch.setattr(main, "db_path", db_path)
+    monkeypatch.setattr(main, "db_pool", pool)
+    monkeypatch.setattr(main, "_tracks_payload_cache", {})
+
+    yield db_path
+
+    pool.close()
+    for suffix in ("", "-wal", "-shm"):
+        if os.path.exists(db_path + suffix):
+            os.unlink(db_path + suffix)
+
+
+@pytest.fixture
+def client(library_db):
+    return TestClient(main.app)
+
+
+class TestListTracks:
+    """Test conditional, compressed and streamed /tracks responses."""
+
+    def test_matching_etag_returns_304(self, client):
+        """A client holding the current body gets no body back."""
+        first = client.get("/tracks")
+        etag = first.headers["etag"]
+
+        second = client.get("/tracks", headers={"If-None-Match": etag})
+
+        assert first.status_code == 200
+        assert second.status_code == 304
+        assert second.content == b""
+        assert second.headers["etag"] == etag
+
+    def test_etag_changes_after_write(self, client, library_db):
+        """A committed write invalidates the client's copy."""
+        etag = client.get("/tracks").headers["etag"]
+
+        with main.db_pool.acquire() as conn, conn:
+            conn.execute("UPDATE tracks SET title = 'A2' WHERE filepath = 'a.mp3'")
+
+        response = client.get("/tracks", headers={"If-None-Match": etag})
+
+        assert response.status_code == 200
+        assert "A2" in [track["title"] for track in response.json()]
+
+    def test_gzip_negotiation(self, client):
+        """The body is compressed only for clients that accept gzip."""
+        plain = client.get("/tracks", headers={"Accept-Encoding": "identity"})
+        with client.stream(
+            "GET", "/tracks", headers={"Accept-Encoding": "gzip"}
+        ) as compressed:
+            raw = b"".join(compressed.iter_raw())
+
+        assert "content-encoding" not in plain.headers
+        assert compressed.headers["content-encoding"] == "gzip"
+        assert compressed.headers["vary"] == "Accept-Encoding"
+        assert compressed.headers["etag"] != plain.headers["etag"]
+        assert gzip.decompress(raw) == plain.content
+
+    def test_ndjson_row_count(self, client):
+        """NDJSON clients get one line per track."""
+        response = client.get(
+            "/tracks?include_bpm=true", headers={"Accept": "application/x-ndjson"}
+        )
+        lines = response.content.splitlines()
+
+        assert response.headers["content-type"] == "application/x-ndjson"
+        assert len(lines) == 3
+        assert [orjson.loads(line)["bpm"] for line in lines] == [120.0, None, 128.0]
+
+
+class TestBatchAnalyze:
+    """Test that batch BPM results are reused while files are unchanged."""
+
+    @pytest.fixture
+    def beat_tracker(self, monkeypatch):
+        """Run beat tracking in threads with a fake that records its calls."""
+        calls = []
+
+        def fake_beat_track(file_path):
+            calls.append(file_path)
+            return 124.0, None
+
+        executor = ThreadPoolExecutor(max_workers=2)
+        monkeypatch.setattr(main, "get_analysis_pool", lambda: executor)
+        monkeypatch.setattr(main, "safe_beat_track", fake_beat_track)
+        yield calls
+        executor.shutdown()
+
+    @pytest.fixture
+    def audio_path(self):
+        with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as f:
+            f.write(b"RIFF")
+            path = f.name
+        yield path
+        os.unlink(path)
+
+    def test_cache_miss_then_hit(self, client, beat_tracker, audio_path):
+        """The second request for an unchanged file skips beat tracking."""
+        first = client.post("/tracks/batch-analyze", json=[audio_path])
+        second = client.post("/tracks/batch-analyze", json=[audio_path])
+
+        assert first.json() == second.json()
+        assert second.json()[0]["bpm"] == 124.0
+        assert beat_tracker == [audio_path]
+
+    def test_changed_file_is_reanalyzed(self, client, beat_tracker, audio_path):
+        """A file whose size or mtime changed misses the cache."""
+        client.post("/tracks/batch-analyze", json=[audio_path])
+        with open(audio_path, "ab") as f:
+            f.write(b"more")
+        client.post("/tracks/batch-analyze", json=[audio_path])
+
+        assert beat_tracker == [audio_path, audio_path]
+
+    def test_duplicate_paths_analyzed_once(self, client, beat_tracker, audio_path):
+        """A path listed twice is tracked once but reported twice."""
+        response = client.post(
+            "/tracks/batch-analyze", json=[audio_path, audio_path, "missing.wav"]
+        )
+        results = response.json()
+
+        assert beat_tracker == [audio_path]
+        assert [r["bpm"] for r in results] == [124.0, 124.0, None]
+        assert results[2]["error"] == "File not found"
@@ -0,0 +1,63 @@
+"""Tests for the vibe search query builder."""
+
+import sqlite3
+
+import pytest
+
+from agents.dj_agent import vibe_search_sql
+
+
+class TestVibeSearchSQL:
+    """Each query shape runs and binds parameters in the documented order."""
+
+    @pytest.fixture
+    def conn(self):
+        conn = sqlite3.connect(":memory:")
+        conn.execute(
+            "CREATE TABLE tracks (id INTEGER PRIMARY KEY, bpm REAL, genre TEXT)"
+        )
+        conn.executemany(
+            "INSERT INTO tracks (id, bpm, genre) VALUES (?, ?, ?)",
+            [
+                (1, 100.0, "House"),
+                (2, 128.0, "Techno"),
+                (3, None, "Techno"),
+                (4, 140.0, None),
+                (5, 90.0, "Ambient"),
+            ],
+        )
+        yield conn
+        conn.close()
+
+    def ids(self, conn, sql, params):
+        return [row[0] for row in conn.execute(sql, params)]
+
+    def test_no_filters(self, conn):
+        """Without a BPM range or genres every track matches."""
+        sql = vibe_search_sql(False, 0, None)
+
+        assert sorted(self.ids(conn, sql, ())) == [1, 2, 3, 4, 5]
+
+    def test_bpm_range_keeps_null_bpm(self, conn):
+        """Tracks with no BPM yet are not excluded by the range."""
+        sql = vibe_search_sql(True, 0, None)
+
+        assert sorted(self.ids(conn, sql, (95, 130))) == [1, 2, 3]
+
+    def test_genres_keep_null_genre(self, conn):
+        """Genre patterns are ORed together and untagged tracks still match."""
+        sql = vibe_search_sql(False, 2, None)
+
+        assert sorted(self.ids(conn, sql, ("%techno%", "%ambient%"))) == [2, 3, 4, 5]
+
+    def test_ordered_with_limit(self, conn):
+        """Ordered shapes bind range, genres, then the limit."""
+        sql = vibe_search_sql(True, 1, "building")
+
+        assert self.ids(conn, sql, (95, 150, "%techno%", 10)) == [3, 2, 4]
+
+    def test_target_order(self, conn):
+        """Target ordering binds its BPM before the limit; NULL counts as 120."""
+        sql = vibe_search_sql(False, 0, "target")
+
+        assert self.ids(conn, sql, (125, 3)) == [2, 3, 4]
@@ -0,0 +1,41 @@
+"""Process pool for CPU-bound beat tracking.
+
+Workers only import ``utils.librosa``, which holds the worker entry point
+(``safe_beat_track``); nothing here may pull in the FastAPI app.
+"""
+
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+
+# Imported once by the fork server, so every worker starts with them loaded
+WORKER_PRELOAD = ["utils.librosa"]
+
+# Created on first use
+_analysis_pool: Optional[ProcessPoolExecutor] = None
+
+
+def get_analysis_pool() -> ProcessPoolExecutor:
+    """Return the shared beat-tracking process pool.
+
+    Workers come from a fork server rather than forking this process: the
+    app runs background threads (kernel warm-up, I/O executor), and a child
+    forked while one of them holds a lock can deadlock on first use.
+    """
+    global _analysis_pool
+    if _analysis_pool is None:
+        context = multiprocessing.get_context("forkserver")
+        context.set_forkserver_preload(WORKER_PRELOAD)
+        _analysis_pool = ProcessPoolExecutor(
+            max_workers=os.cpu_count(), mp_context=context
+        )
+    return _analysis_pool
+
+
+def reset_analysis_pool():
+    """Discard the process pool so the next caller gets a new one."""
+    global _analysis_pool
+    if _analysis_pool is not None:
+        _analysis_pool.shutdown(wait=False, cancel_futures=True)
+        _analysis_pool = None
@@ -5,11 +5,16 @@ import sqlite3
 import logging
 import os
 from datetime import datetime
-from typing import Optional, Dict, List
+from typing import Callable, Optional, Dict, List, Tuple
 from dataclasses import dataclass
 
+from utils.music_library import scan_audio_files
+
 logger = logging.getLogger(__name__)
 
+# Rows written per transaction by add_tracks_bulk
+BULK_ENQUEUE_BATCH = 500
+
 
 @dataclass
 class AnalysisJob:
@@ -37,6 +42,14 @@ class AnalysisQueue:
         self.progress: Dict[str, Dict] = {}
         self.running = False
         self._analyzer = None  # Will be set when starting
+        # Cached status counts, rebuilt lazily after any state change
+        self._status_counts: Optional[Dict[str, int]] = None
+        # Called with the filepath after each successful job
+        self.on_complete: Optional[Callable[[str], None]] = None
+
+    def invalidate_status(self):
+        """Drop the cached status counts so the next poll re-reads them."""
+        self._status_counts = None
 
     async def start(self, analyzer):
         """Start the analysis queue workers."""
@@ -85,6 +98,7 @@ class AnalysisQueue:
 
             job_id = cursor.lastrowid
             conn.commit()
+            self.invalidate_status()
 
             # Add to in-memory queue
             await self.queue.put((priority, job_id, filepath))
@@ -95,23 +109,76 @@ class AnalysisQueue:
         finally:
             conn.close()
 
+    async def add_tracks_bulk(self, filepaths: List[str], priority: int = 5) -> int:
+        """Add many tracks to the queue, returning how many were queued.
+
+        Rows are written in batched transactions on a worker thread, so large
+        reprocess requests don't block the event loop one insert at a time.
+        """
+        loop = asyncio.get_running_loop()
+        jobs = await loop.run_in_executor(
+            None, self._insert_jobs, filepaths, priority
+        )
+        self.invalidate_status()
+
+        for job_id, filepath in jobs:
+            self.queue.put_nowait((priority, job_id, filepath))
+
+        logger.info(f"Added {len(jobs)} tracks to analysis queue")
+        return len(jobs)
+
+    def _insert_jobs(
+        self, filepaths: List[str], priority: int
+    ) -> List[Tuple[int, str]]:
+        """Insert pending jobs and return their (job_id, filepath) pairs."""
+        conn = sqlite3.connect(self.db_path)
+        jobs = []
+
+        try:
+            for start in range(0, len(filepaths), BULK_ENQUEUE_BATCH):
+                with conn:
+                    for filepath in filepaths[start : start + BULK_ENQUEUE_BATCH]:
+                        cursor = conn.execute(
+                            """
+                            INSERT OR REPLACE INTO analysis_queue
+                            (filepath, priority, status, created_at)
+                            VALUES (?, ?, 'pending', CURRENT_TIMESTAMP)
+                        """,
+                            (filepath, priority),
+                        )
+                        jobs.append((cursor.lastrowid, filepath))
+        finally:
+            conn.close()
+
+        return jobs
+
     async def add_folder(self, folder_path: str, priority: int = 5):
         """Add all audio files in a folder to the queue."""
-        audio_extensions = {".mp3", ".m4a", ".wav", ".flac", ".ogg", ".aac"}
-        added_count = 0
-
-        for root, _, files in os.walk(folder_path):
-            for filename in files:
-                if any(filename.lower().endswith(ext) for ext in audio_extensions):
-                    filepath = os.path.join(root, filename)
-                    await self.add_track(filepath, priority)
-                    added_count += 1
+        filepaths = await asyncio.to_thread(scan_audio_files, folder_path)
+        added_count = await self.add_tracks_bulk(filepaths, priority)
 
         logger.info(f"Added {added_count} tracks from {folder_path}")
         return added_count
 
     async def get_status(self) -> Dict:
         """Get current queue status."""
+        status_counts = self._status_counts
+        if status_counts is None:
+            status_counts = self._load_status_counts()
+            self._status_counts = status_counts
+
+        return {
+            "pending": status_counts.get("pending", 0),
+            "processing": status_counts.get("processing", 0),
+            "completed": status_counts.get("completed", 0),
+            "failed": status_counts.get("failed", 0),
+            "total": sum(status_counts.values()),
+            "workers": len(self.workers),
+            "running": self.running,
+        }
+
+    def _load_status_counts(self) -> Dict[str, int]:
+        """Count queue rows per status."""
         conn = sqlite3.connect(self.db_path)
         cursor = conn.cursor()
 
@@ -121,18 +188,7 @@ class AnalysisQueue:
                 FROM analysis_queue 
                 GROUP BY status
             """)
-
-            status_counts = dict(cursor.fetchall())
-
-            return {
-                "pending": status_counts.get("pending", 0),
-                "processing": status_counts.get("processing", 0),
-                "completed": status_counts.get("completed", 0),
-                "failed": status_counts.get("failed", 0),
-                "total": sum(status_counts.values()),
-                "workers": len(self.workers),
-                "running": self.running,
-            }
+            return dict(cursor.fetchall())
 
         finally:
             conn.close()
@@ -164,6 +220,7 @@ class AnalysisQueue:
 
             jobs = cursor.fetchall()
             conn.commit()
+            self.invalidate_status()
 
             # Add to queue
             for job_id, filepath, priority in jobs:
@@ -213,6 +270,7 @@ class AnalysisQueue:
                 (job_id,),
             )
             conn.commit()
+            self.invalidate_status()
 
             logger.info(f"{worker_name} analyzing: {filepath}")
 
@@ -255,6 +313,9 @@ class AnalysisQueue:
 
                 self.progress[filepath]["status"] = "completed"
                 logger.info(f"{worker_name} completed: {filepath}")
+                conn.commit()
+                if self.on_complete:
+                    self.on_complete(filepath)
 
             else:
                 raise Exception("Analysis failed")
@@ -279,6 +340,7 @@ class AnalysisQueue:
         finally:
             conn.commit()
             conn.close()
+            self.invalidate_status()
 
             # Clean up old progress entries
             if len(self.progress) > 100:
@@ -321,6 +383,7 @@ class AnalysisQueue:
                 await self.queue.put((priority, job_id, filepath))
 
             conn.commit()
+            self.invalidate_status()
             logger.info(f"Retrying {len(failed_jobs)} failed jobs")
 
         finally:
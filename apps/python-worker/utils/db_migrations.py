@@ -1,12 +1,25 @@
 """Database migration system for Streamie."""
 
 import os
+import json
 import sqlite3
 import logging
 from typing import List, Tuple
 
+from utils.sqlite_db import pack_beat_times
+
 logger = logging.getLogger(__name__)
 
+# Migrations that only add indexes or triggers to the tracks table. They are
+# left pending on a database without one and applied on the first run after
+# it exists.
+TRACKS_TABLE_MIGRATIONS = {
+    "add_track_beat_times_sync_triggers.sql",
+    "add_tracks_filepath_index.sql",
+    "add_tracks_listing_index.sql",
+    "add_tracks_bpm_index.sql",
+}
+
 
 class MigrationRunner:
     """Handles database migrations for the Streamie music database."""
@@ -62,6 +75,14 @@ class MigrationRunner:
 
         return pending
 
+    def table_exists(self, cursor, table_name: str) -> bool:
+        """Check if a table exists in the database."""
+        cursor.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?",
+            (table_name,),
+        )
+        return cursor.fetchone() is not None
+
     def column_exists(self, cursor, table_name: str, column_name: str) -> bool:
         """Check if a column exists in a table."""
         cursor.execute(f"PRAGMA table_info({table_name})")
@@ -74,9 +95,20 @@ class MigrationRunner:
         cursor = conn.cursor()
 
         try:
+            if filename in TRACKS_TABLE_MIGRATIONS and not self.table_exists(
+                cursor, "tracks"
+            ):
+                logger.info(f"No tracks table yet, deferring migration: {filename}")
+                return
+
             # Special handling for the music folders migration
             if filename == "add_music_folders_and_metadata.sql":
                 self._apply_music_folders_migration(cursor)
+            elif filename == "add_track_beat_times_blob.sql":
+                cursor.executescript(content)
+                self._backfill_beat_times_blobs(cursor)
+            elif filename == "add_tracks_filepath_index.sql":
+                self._apply_filepath_index_migration(cursor)
             else:
                 # Execute the migration normally
                 cursor.executescript(content)
@@ -198,6 +230,61 @@ class MigrationRunner:
                 "UPDATE tracks SET analysis_version = 2 WHERE analysis_version < 2 OR analysis_version IS NULL"
             )
 
+    def _backfill_beat_times_blobs(self, cursor):
+        """Re-encode existing JSON beat_times into track_beat_times."""
+        if not self.table_exists(cursor, "tracks") or not self.column_exists(
+            cursor, "tracks", "beat_times"
+        ):
+            logger.info("No tracks.beat_times column, skipping beat times backfill")
+            return
+
+        cursor.execute(
+            "SELECT filepath, beat_times FROM tracks WHERE beat_times IS NOT NULL"
+        )
+        blobs = []
+        for filepath, beat_times in cursor.fetchall():
+            try:
+                blobs.append((filepath, pack_beat_times(json.loads(beat_times))))
+            except (ValueError, TypeError) as e:
+                logger.warning(f"Skipping unreadable beat_times for {filepath}: {e}")
+
+        cursor.executemany(
+            "INSERT OR REPLACE INTO track_beat_times (filepath, beat_times) VALUES (?, ?)",
+            blobs,
+        )
+        logger.info(f"Stored float32 beat times for {len(blobs)} tracks")
+
+    def has_unique_index(self, cursor, table_name: str, column_name: str) -> bool:
+        """Check if a single-column unique index covers a column."""
+        cursor.execute(f"PRAGMA index_list({table_name})")
+        for row in cursor.fetchall():
+            index_name, unique = row[1], row[2]
+            if not unique:
+                continue
+            cursor.execute(f"PRAGMA index_info('{index_name}')")
+            if [info[2] for info in cursor.fetchall()] == [column_name]:
+                return True
+        return False
+
+    def _apply_filepath_index_migration(self, cursor):
+        """Ensure exactly one index serves tracks.filepath lookups."""
+        if self.has_unique_index(cursor, "tracks", "filepath"):
+            # The UNIQUE constraint's autoindex already covers filepath
+            cursor.execute("DROP INDEX IF EXISTS idx_filepath")
+        else:
+            try:
+                cursor.execute(
+                    "CREATE UNIQUE INDEX IF NOT EXISTS idx_tracks_filepath ON tracks(filepath)"
+                )
+            except sqlite3.IntegrityError as e:
+                # Duplicate rows: keep (or create) the plain index instead
+                logger.warning(f"Could not create unique filepath index: {e}")
+                cursor.execute(
+                    "CREATE INDEX IF NOT EXISTS idx_filepath ON tracks(filepath)"
+                )
+
+        cursor.execute("ANALYZE")
+
     def run_migrations(self):
         """Run all pending migrations."""
         self.ensure_migrations_table()
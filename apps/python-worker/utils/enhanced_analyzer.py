@@ -1,5 +1,6 @@
 """Enhanced track analyzer with key detection and structure analysis."""
 
+import asyncio
 import os
 import json
 import logging
@@ -8,6 +9,10 @@ import numpy as np
 from typing import Dict, List, Optional
 import essentia.standard as es
 
+from utils.librosa import load_native
+from utils.numba_kernels import rms as rms_frames
+from utils.sqlite_db import pack_beat_times
+
 logger = logging.getLogger(__name__)
 
 
@@ -18,40 +23,17 @@ class EnhancedTrackAnalyzer:
         self.db_path = db_path
 
     async def analyze_file(self, filepath: str) -> bool:
-        """Analyze a single audio file and store results in database."""
+        """Analyze a single audio file and store results in database.
+
+        Decoding, feature extraction and the database write all block, so
+        they run on worker threads and queue workers can overlap.
+        """
         try:
             logger.info(f"Starting enhanced analysis for: {filepath}")
 
-            # Load audio
-            y, sr = librosa.load(filepath, sr=None)
-            duration = len(y) / sr
-
-            # Basic analysis
-            tempo, beats = librosa.beat.beat_track(y=y, sr=sr)
-            beat_times = librosa.frames_to_time(beats, sr=sr).tolist()
-
-            # Key detection using Essentia
-            key_info = self._detect_key(filepath)
-
-            # Structure analysis
-            structure = self._analyze_structure(y, sr, tempo)
-
-            # Generate auto hot cues
-            hot_cues = self._generate_hot_cues(structure, beat_times, duration)
-
-            # Energy and mood analysis
-            energy_info = self._analyze_energy(y, sr)
-
-            # Store in database
-            success = await self._store_analysis(
-                filepath=filepath,
-                tempo=float(tempo),
-                beat_times=beat_times,
-                key_info=key_info,
-                structure=structure,
-                hot_cues=hot_cues,
-                energy_info=energy_info,
-                duration=duration,
+            analysis = await asyncio.to_thread(self._analyze_audio, filepath)
+            success = await asyncio.to_thread(
+                self._store_analysis, filepath=filepath, **analysis
             )
 
             logger.info(f"Enhanced analysis completed for: {filepath}")
@@ -61,16 +43,54 @@ class EnhancedTrackAnalyzer:
             logger.error(f"Enhanced analysis failed for {filepath}: {e}")
             return False
 
-    def _detect_key(self, filepath: str) -> Dict:
-        """Detect musical key using Essentia."""
-        try:
-            # Load audio with Essentia
-            loader = es.MonoLoader(filename=filepath)
-            audio = loader()
+    def _analyze_audio(self, filepath: str) -> Dict:
+        """Run every analysis step for a file, returning _store_analysis kwargs."""
+        # Signature of the version being decoded; a full library scan compares
+        # it against the file on disk to find tracks that need re-analysis
+        st = os.stat(filepath)
+
+        # Load audio
+        y, sr = load_native(filepath)
+        duration = len(y) / sr
+
+        # Basic analysis
+        tempo, beats = librosa.beat.beat_track(y=y, sr=sr)
+        beat_times = librosa.frames_to_time(beats, sr=sr).tolist()
+
+        # Key detection using Essentia
+        key_info = self._detect_key(y, sr)
+
+        # Structure analysis
+        structure = self._analyze_structure(y, sr, tempo)
+
+        # Generate auto hot cues
+        hot_cues = self._generate_hot_cues(structure, beat_times, duration)
+
+        # Energy and mood analysis
+        energy_info = self._analyze_energy(y, sr)
+
+        return {
+            "tempo": float(tempo),
+            "beat_times": beat_times,
+            "key_info": key_info,
+            "structure": structure,
+            "hot_cues": hot_cues,
+            "energy_info": energy_info,
+            "duration": duration,
+            "file_size": st.st_size,
+            "last_modified": st.st_mtime,
+        }
+
+    def _detect_key(self, y: np.ndarray, sr: int) -> Dict:
+        """Detect musical key using Essentia.
 
+        Runs on the samples already decoded for the librosa features rather
+        than decoding and resampling the file a second time.
+        """
+        try:
             # Use key detection algorithm
-            key_detector = es.KeyExtractor()
-            key, scale, strength = key_detector(audio)
+            key_detector = es.KeyExtractor(sampleRate=sr)
+            key, scale, strength = key_detector(np.ascontiguousarray(y))
 
             # Convert to Camelot notation for DJ compatibility
             camelot = self._key_to_camelot(key, scale)
@@ -112,28 +132,39 @@ class EnhancedTrackAnalyzer:
             bounds = librosa.segment.agglomerative(rec_mat, 15)
             bound_times = librosa.frames_to_time(bounds, sr=sr, hop_length=hop_length)
 
+            # Per-segment feature means, all segments at once: reduceat sums
+            # each [bound, next bound) span, and the sum past the last bound
+            # is dropped
+            bound_frames = (bound_times * sr / hop_length).astype(int)
+            lengths = np.diff(bound_frames)
+            with np.errstate(invalid="ignore", divide="ignore"):
+                segment_energies = (
+                    np.add.reduceat(spectral_centroids, bound_frames)[:-1] / lengths
+                )
+                segment_chromas = (
+                    np.add.reduceat(chroma, bound_frames, axis=1)[:, :-1] / lengths
+                )
+
+            # reduceat yields the element at a repeated bound rather than an
+            # empty sum; an empty segment has no mean
+            empty = lengths == 0
+            segment_energies[empty] = np.nan
+            segment_chromas[:, empty] = np.nan
+
             # Analyze each segment
             segments = []
             for i in range(len(bound_times) - 1):
-                start = bound_times[i]
-                end = bound_times[i + 1]
-
-                # Extract features for this segment
-                start_frame = int(start * sr / hop_length)
-                end_frame = int(end * sr / hop_length)
-
-                segment_energy = np.mean(spectral_centroids[start_frame:end_frame])
-                segment_chroma = np.mean(chroma[:, start_frame:end_frame], axis=1)
+                segment_energy = segment_energies[i]
 
                 # Classify segment type based on features
                 segment_type = self._classify_segment(
-                    segment_energy, segment_chroma, i, len(bound_times) - 1
+                    segment_energy, segment_chromas[:, i], i, len(bound_times) - 1
                 )
 
                 segments.append(
                     {
-                        "start": float(start),
-                        "end": float(end),
+                        "start": float(bound_times[i]),
+                        "end": float(bound_times[i + 1]),
                         "type": segment_type,
                         "energy": float(segment_energy),
                     }
@@ -235,7 +266,7 @@ class EnhancedTrackAnalyzer:
         """Analyze energy characteristics of the track."""
         try:
             # RMS energy
-            rms = librosa.feature.rms(y=y)[0]
+            rms = rms_frames(y)
 
             # Spectral centroid (brightness)
             cent = librosa.feature.spectral_centroid(y=y, sr=sr)[0]
@@ -316,7 +347,7 @@ class EnhancedTrackAnalyzer:
 
         return camelot_wheel.get((key, scale.lower()))
 
-    async def _store_analysis(
+    def _store_analysis(
         self,
         filepath: str,
         tempo: float,
@@ -326,6 +357,8 @@ class EnhancedTrackAnalyzer:
         hot_cues: List[Dict],
         energy_info: Dict,
         duration: float,
+        file_size: int,
+        last_modified: float,
     ) -> bool:
         """Store analysis results in the database."""
         import sqlite3
@@ -351,6 +384,8 @@ class EnhancedTrackAnalyzer:
                     energy_profile = ?,
                     structure = ?,
                     hot_cues = ?,
+                    file_size = ?,
+                    last_modified = ?,
                     analysis_status = 'completed',
                     analyzed_at = CURRENT_TIMESTAMP
                 WHERE filepath = ?
@@ -366,6 +401,8 @@ class EnhancedTrackAnalyzer:
                     energy_info.get("profile"),
                     json.dumps(structure),
                     json.dumps(hot_cues),
+                    file_size,
+                    last_modified,
                     rel_path,
                 ),
             )
@@ -383,9 +420,9 @@ class EnhancedTrackAnalyzer:
                         filename, filepath, duration, title, artist, album,
                         genre, year, has_artwork, bpm, beat_times, key,
                         key_scale, key_confidence, camelot_key, energy_level,
-                        energy_profile, structure, hot_cues, analysis_status,
-                        analyzed_at
-                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, 'completed', CURRENT_TIMESTAMP)
+                        energy_profile, structure, hot_cues, file_size,
+                        last_modified, analysis_status, analyzed_at
+                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, 'completed', CURRENT_TIMESTAMP)
                 """,
                     (
                         os.path.basename(filepath),
@@ -407,9 +444,17 @@ class EnhancedTrackAnalyzer:
                         energy_info.get("profile"),
                         json.dumps(structure),
                         json.dumps(hot_cues),
+                        file_size,
+                        last_modified,
                     ),
                 )
 
+            # Packed copy of the beat grid for fast reads
+            cursor.execute(
+                "INSERT OR REPLACE INTO track_beat_times (filepath, beat_times) VALUES (?, ?)",
+                (rel_path, pack_beat_times(beat_times)),
+            )
+
             conn.commit()
             return True
 
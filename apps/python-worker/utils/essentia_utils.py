@@ -1,12 +1,15 @@
 """Utilities for audio analysis using the Essentia library."""
 
+import logging
 from typing import Dict
 
+logger = logging.getLogger(__name__)
+
 try:
     from essentia.standard import MusicExtractor
 except Exception as e:  # pragma: no cover - library may not be installed
     MusicExtractor = None  # type: ignore
-    print(f"Essentia not available: {e}")
+    logger.warning(f"Essentia not available: {e}")
 
 
 def analyze_mood(file_path: str) -> Dict[str, float]:
@@ -39,5 +42,5 @@ def analyze_mood(file_path: str) -> Dict[str, float]:
                 mood[key] = float(value[0])
         return mood
     except Exception as e:
-        print(f"Error running Essentia mood analysis on {file_path}: {e}")
+        logger.error(f"Error running Essentia mood analysis on {file_path}: {e}")
         return {}
@@ -18,7 +18,8 @@ logger = logging.getLogger(__name__)
 class MusicFileHandler(FileSystemEventHandler):
     """Handles file system events for music files."""
 
-    AUDIO_EXTENSIONS = {".mp3", ".m4a", ".wav", ".flac", ".ogg", ".aac", ".m4p"}
+    # A tuple so one str.endswith call checks every suffix
+    AUDIO_EXTENSIONS = (".mp3", ".m4a", ".wav", ".flac", ".ogg", ".aac", ".m4p")
 
     def __init__(self, analysis_queue, db_path: str):
         self.analysis_queue = analysis_queue
@@ -27,7 +28,7 @@ class MusicFileHandler(FileSystemEventHandler):
 
     def is_audio_file(self, path: str) -> bool:
         """Check if the file is an audio file."""
-        return any(path.lower().endswith(ext) for ext in self.AUDIO_EXTENSIONS)
+        return path.lower().endswith(self.AUDIO_EXTENSIONS)
 
     def should_process(self, path: str) -> bool:
         """Check if the file should be processed."""
@@ -128,8 +129,12 @@ class MusicFileHandler(FileSystemEventHandler):
         try:
             rel_path = os.path.relpath(filepath)
             cursor.execute("DELETE FROM tracks WHERE filepath = ?", (rel_path,))
+            cursor.execute(
+                "DELETE FROM track_beat_times WHERE filepath = ?", (rel_path,)
+            )
             cursor.execute("DELETE FROM analysis_queue WHERE filepath = ?", (filepath,))
             conn.commit()
+            self.analysis_queue.invalidate_status()
             logger.info(f"Removed from database: {filepath}")
         except Exception as e:
             logger.error(f"Error removing file from database {filepath}: {e}")
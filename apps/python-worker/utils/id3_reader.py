@@ -2,10 +2,13 @@ from mutagen.mp3 import MP3
 from mutagen.mp4 import MP4
 from mutagen.flac import FLAC
 from mutagen.oggvorbis import OggVorbis
-from mutagen.id3 import APIC
+from mutagen.id3 import APIC, ID3, ID3NoHeaderError
+import logging
 import os
 from typing import Dict, Optional, Tuple
 
+logger = logging.getLogger(__name__)
+
 
 def read_audio_metadata(file_path: str) -> Dict[str, Optional[str]]:
     """
@@ -169,7 +172,7 @@ def read_audio_metadata(file_path: str) -> Dict[str, Optional[str]]:
                 metadata[key] = ""
 
     except Exception as e:
-        print(f"Error reading metadata from {file_path}: {str(e)}")
+        logger.warning(f"Error reading metadata from {file_path}: {e}")
         # Return filename as title if we can't read metadata
         metadata["title"] = os.path.splitext(os.path.basename(file_path))[0]
 
@@ -190,13 +193,15 @@ def extract_artwork(file_path: str) -> Optional[Tuple[bytes, str]]:
         ext = os.path.splitext(file_path)[1].lower()
 
         if ext == ".mp3":
-            audio = MP3(file_path)
-            tags = audio.tags
+            # Read just the ID3 tag; MP3() would also sync to and parse the
+            # MPEG stream, which artwork doesn't need
+            try:
+                tags = ID3(file_path)
+            except ID3NoHeaderError:
+                return None
 
-            if tags:
-                for tag in tags.values():
-                    if isinstance(tag, APIC):
-                        return (tag.data, tag.mime)
+            for tag in tags.getall("APIC"):
+                return (tag.data, tag.mime)
 
         elif ext in [".m4a", ".mp4"]:
             audio = MP4(file_path)
@@ -223,6 +228,6 @@ def extract_artwork(file_path: str) -> Optional[Tuple[bytes, str]]:
                 return (picture.data, picture.mime)
 
     except Exception as e:
-        print(f"Error extracting artwork from {file_path}: {str(e)}")
+        logger.warning(f"Error extracting artwork from {file_path}: {e}")
 
     return None
@@ -1,7 +1,30 @@
 """Utility functions for audio analysis using librosa."""
 
+import logging
+
 import librosa
-from typing import Dict
+import numpy as np
+import soundfile as sf
+from typing import Dict, Optional, Tuple
+
+from utils.numba_kernels import rms, to_mono
+
+logger = logging.getLogger(__name__)
+
+
+def load_native(file_path: str) -> Tuple[np.ndarray, int]:
+    """Load a file as mono float32 at its native sample rate.
+
+    Reads straight through soundfile, skipping librosa.load's resampling and
+    dtype round trips; formats libsndfile can't open go through librosa.
+    """
+    try:
+        y, sr = sf.read(file_path, dtype="float32", always_2d=False)
+    except sf.LibsndfileError:
+        return librosa.load(file_path, sr=None)
+    if y.ndim == 2:
+        y = to_mono(y)
+    return y, sr
 
 
 def analyze_track(file_path: str) -> Dict[str, any]:
@@ -15,7 +38,7 @@ def analyze_track(file_path: str) -> Dict[str, any]:
             "beat_times": beat_times.tolist(),
         }
     except Exception as e:
-        print(f"Error analyzing track {file_path}: {e}")
+        logger.error(f"Error analyzing track {file_path}: {e}")
         raise
 
 
@@ -23,3 +46,28 @@ def run_beat_track(file_path: str) -> float:
     """Compatibility wrapper that returns only the BPM."""
     result = analyze_track(file_path)
     return result["bpm"]
+
+
+def safe_beat_track(file_path: str) -> Tuple[Optional[float], Optional[str]]:
+    """Return (bpm, None) on success or (None, error message) on failure.
+
+    Meant for process pools: errors come back as plain strings, so a failing
+    file never depends on its exception pickling cleanly across processes.
+    """
+    try:
+        return run_beat_track(file_path), None
+    except Exception as e:
+        return None, str(e)
+
+
+def warm_up():
+    """Run each compiled analysis routine once on silence.
+
+    librosa's beat tracker and our numba kernels compile (or load from the
+    numba cache) on first call; doing that at startup keeps the delay out of
+    the first analysis.
+    """
+    y = np.zeros(22050 * 2, dtype=np.float32)
+    librosa.beat.beat_track(y=y, sr=22050)
+    rms(y)
+    to_mono(np.zeros((16, 2), dtype=np.float32))
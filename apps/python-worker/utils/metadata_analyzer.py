@@ -2,6 +2,7 @@
 
 import os
 import sqlite3
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, Optional
 from mutagen import File
 from mutagen.mp3 import MP3
@@ -11,6 +12,9 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+# Tag reads are I/O-bound, so use more threads than cores
+TAG_READ_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+
 
 class MetadataAnalyzer:
     """Fast metadata-only analyzer that doesn't load audio data."""
@@ -109,27 +113,71 @@ class MetadataAnalyzer:
     def batch_analyze_metadata(self, filepaths: list, batch_size: int = 100) -> int:
         """Analyze metadata for multiple files efficiently."""
         analyzed_count = 0
+        skipped_count = 0
 
-        for i in range(0, len(filepaths), batch_size):
-            batch = filepaths[i : i + batch_size]
-            batch_results = []
+        with ThreadPoolExecutor(max_workers=TAG_READ_WORKERS) as pool:
+            for i in range(0, len(filepaths), batch_size):
+                batch = filepaths[i : i + batch_size]
 
-            for filepath in batch:
-                metadata = self.analyze_metadata_only(filepath)
-                if metadata:
-                    batch_results.append(metadata)
+                # Files whose tags were read before and haven't changed since
+                # would parse to the same metadata, so leave them alone
+                scanned = self._load_scan_signatures(batch)
+                to_read = [
+                    filepath
+                    for filepath in batch
+                    if not self._is_unchanged(filepath, scanned.get(filepath))
+                ]
+                skipped_count += len(batch) - len(to_read)
 
-            # Batch insert/update in database
-            if batch_results:
-                self._batch_update_database(batch_results)
-                analyzed_count += len(batch_results)
+                # Read the batch's tags concurrently; map keeps input order
+                batch_results = [
+                    metadata
+                    for metadata in pool.map(self.analyze_metadata_only, to_read)
+                    if metadata
+                ]
 
-            logger.info(
-                f"Analyzed metadata for {analyzed_count}/{len(filepaths)} tracks"
-            )
+                # Batch insert/update in database
+                if batch_results:
+                    self._batch_update_database(batch_results)
+                    analyzed_count += len(batch_results)
+
+                logger.info(
+                    f"Analyzed metadata for {analyzed_count}/{len(filepaths)} tracks"
+                    f" ({skipped_count} unchanged)"
+                )
 
         return analyzed_count
 
+    def _load_scan_signatures(self, filepaths: list) -> Dict[str, tuple]:
+        """Get (file_size, last_modified) for tracks whose tags were already read."""
+        conn = sqlite3.connect(self.db_path)
+
+        try:
+            placeholders = ",".join("?" * len(filepaths))
+            cursor = conn.execute(
+                f"""
+                SELECT filepath, file_size, last_modified FROM tracks
+                WHERE filepath IN ({placeholders})
+                AND analysis_status = 'metadata_complete'
+            """,
+                filepaths,
+            )
+            return {row[0]: (row[1], row[2]) for row in cursor.fetchall()}
+
+        finally:
+            conn.close()
+
+    @staticmethod
+    def _is_unchanged(filepath: str, signature: Optional[tuple]) -> bool:
+        """Check a file's size and mtime against a stored signature."""
+        if signature is None or None in signature:
+            return False
+        try:
+            st = os.stat(filepath)
+        except OSError:
+            return False
+        return (st.st_size, st.st_mtime) == signature
+
     def _batch_update_database(self, metadata_list: list):
         """Batch update database with metadata."""
         conn = sqlite3.connect(self.db_path)
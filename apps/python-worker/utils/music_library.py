@@ -3,16 +3,96 @@
 import os
 import sqlite3
 import logging
-from typing import List, Dict, Optional
+import threading
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional
+
+from utils.sqlite_pool import CONNECTION_PRAGMAS
 
 logger = logging.getLogger(__name__)
 
+# Suffixes picked up by folder scans, as a tuple for str.endswith
+AUDIO_EXTENSIONS = (".mp3", ".m4a", ".wav", ".flac", ".ogg", ".aac", ".m4p")
+
+
+def iter_audio_entries(folder_path: str) -> Iterator[os.DirEntry]:
+    """Walk a folder tree, yielding a DirEntry for each audio file.
+
+    Directory type comes from the listing itself, and each entry caches its
+    stat result, so callers needing size or mtime pay at most one syscall.
+    Unreadable directories are skipped, as os.walk would.
+    """
+    pending = [folder_path]
+    while pending:
+        directory = pending.pop()
+        try:
+            with os.scandir(directory) as it:
+                for entry in it:
+                    if entry.is_dir(follow_symlinks=False):
+                        pending.append(entry.path)
+                    elif entry.name.lower().endswith(AUDIO_EXTENSIONS):
+                        yield entry
+        except OSError as e:
+            logger.warning(f"Skipping unreadable folder {directory}: {e}")
+
+
+def scan_audio_files(folder_path: str) -> List[str]:
+    """Paths of every audio file under a folder."""
+    return [entry.path for entry in iter_audio_entries(folder_path)]
+
+
+# A track needs metadata if it's missing:
+# - Title AND Artist (basic metadata)
+# - OR has no BPM (needed for DJ features)
+# - OR has never been analyzed (analysis_version is NULL or < 2)
+NEEDS_METADATA_SQL = """(
+    (title IS NULL AND artist IS NULL) OR
+    bpm IS NULL OR
+    analysis_version IS NULL OR
+    analysis_version < 2
+)"""
+
+# Tracks with basic metadata that are missing enhanced features
+NEEDS_ENHANCED_SQL = """(
+    title IS NOT NULL AND
+    artist IS NOT NULL AND
+    bpm IS NOT NULL
+) AND (
+    key IS NULL OR
+    key_scale IS NULL OR
+    energy_profile IS NULL OR
+    structure IS NULL
+)"""
+
 
 class MusicLibraryManager:
     """Manages music folders and library configuration."""
 
     def __init__(self, db_path: str):
         self.db_path = db_path
+        self._local = threading.local()
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """Use this thread's connection, opening it on first use.
+
+        Library calls arrive from the event loop and from worker threads, so
+        each thread keeps one connection open instead of reconnecting (and
+        re-reading the schema) on every call.
+        """
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, cached_statements=64)
+            conn.row_factory = sqlite3.Row
+            for pragma in CONNECTION_PRAGMAS:
+                conn.execute(pragma)
+            self._local.conn = conn
+        try:
+            yield conn
+        finally:
+            # Leave no half-finished transaction for this thread's next call
+            if conn.in_transaction:
+                conn.rollback()
 
     def add_music_folder(self, folder_path: str, auto_scan: bool = True) -> Dict:
         """Add a music folder to the library."""
@@ -25,10 +105,9 @@ class MusicLibraryManager:
         if not os.access(folder_path, os.R_OK):
             raise ValueError(f"No read permission for folder: {folder_path}")
 
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        with self._connect() as conn:
+            cursor = conn.cursor()
 
-        try:
             cursor.execute(
                 """
                 INSERT OR REPLACE INTO music_folders 
@@ -51,15 +130,12 @@ class MusicLibraryManager:
                 "status": "added",
             }
 
-        finally:
-            conn.close()
 
     def remove_music_folder(self, folder_path: str) -> bool:
         """Remove a music folder from the library."""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        with self._connect() as conn:
+            cursor = conn.cursor()
 
-        try:
             cursor.execute("DELETE FROM music_folders WHERE path = ?", (folder_path,))
             affected = cursor.rowcount
             conn.commit()
@@ -69,16 +145,12 @@ class MusicLibraryManager:
                 return True
             return False
 
-        finally:
-            conn.close()
 
     def get_music_folders(self) -> List[Dict]:
         """Get all configured music folders."""
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
-        cursor = conn.cursor()
+        with self._connect() as conn:
+            cursor = conn.cursor()
 
-        try:
             cursor.execute("""
                 SELECT id, path, enabled, auto_scan, last_scan, created_at
                 FROM music_folders
@@ -97,15 +169,12 @@ class MusicLibraryManager:
 
             return folders
 
-        finally:
-            conn.close()
 
     def update_folder_scan_time(self, folder_path: str):
         """Update the last scan time for a folder."""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        with self._connect() as conn:
+            cursor = conn.cursor()
 
-        try:
             cursor.execute(
                 """
                 UPDATE music_folders 
@@ -116,72 +185,77 @@ class MusicLibraryManager:
             )
             conn.commit()
 
-        finally:
-            conn.close()
 
     def scan_folder_for_tracks(self, folder_path: str) -> List[str]:
         """Scan a folder for audio files."""
-        audio_extensions = {".mp3", ".m4a", ".wav", ".flac", ".ogg", ".aac", ".m4p"}
-        tracks = []
+        return scan_audio_files(folder_path)
 
-        try:
-            for root, _, files in os.walk(folder_path):
-                for filename in files:
-                    if any(filename.lower().endswith(ext) for ext in audio_extensions):
-                        filepath = os.path.join(root, filename)
-                        tracks.append(filepath)
-
-        except Exception as e:
-            logger.error(f"Error scanning folder {folder_path}: {e}")
-
-        return tracks
+    def get_new_tracks(
+        self, folder_path: str, include_changed: bool = False
+    ) -> List[str]:
+        """Get tracks in folder that aren't in the database.
 
-    def get_new_tracks(self, folder_path: str) -> List[str]:
-        """Get tracks in folder that aren't in the database."""
-        tracks = self.scan_folder_for_tracks(folder_path)
+        With include_changed, also return known tracks whose size or mtime on
+        disk no longer matches what was recorded when they were scanned.
+        """
+        entries = list(iter_audio_entries(folder_path))
 
-        if not tracks:
+        if not entries:
             return []
 
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        with self._connect() as conn:
+            cursor = conn.cursor()
 
-        try:
             # Get relative paths of existing tracks
-            cursor.execute("SELECT filepath FROM tracks")
-            existing_paths = {row[0] for row in cursor.fetchall()}
+            if include_changed:
+                cursor.execute(
+                    "SELECT filepath, file_size, last_modified FROM tracks"
+                )
+                existing = {row[0]: (row[1], row[2]) for row in cursor.fetchall()}
+            else:
+                cursor.execute("SELECT filepath FROM tracks")
+                existing = dict.fromkeys(row[0] for row in cursor.fetchall())
 
             # Find new tracks
             new_tracks = []
-            for track_path in tracks:
+            for entry in entries:
+                track_path = entry.path
                 # Check both absolute and relative paths
                 rel_path = os.path.relpath(track_path)
-                if rel_path not in existing_paths and track_path not in existing_paths:
+                if rel_path in existing:
+                    recorded = existing[rel_path]
+                elif track_path in existing:
+                    recorded = existing[track_path]
+                else:
                     new_tracks.append(track_path)
+                    continue
+
+                # Unchanged (size, mtime) means the stored analysis still applies
+                if include_changed and None not in recorded:
+                    try:
+                        st = entry.stat()
+                    except OSError:
+                        continue
+                    if (st.st_size, st.st_mtime) != recorded:
+                        new_tracks.append(track_path)
 
             return new_tracks
 
-        finally:
-            conn.close()
 
     def get_settings(self) -> Dict[str, str]:
         """Get all settings from the database."""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        with self._connect() as conn:
+            cursor = conn.cursor()
 
-        try:
             cursor.execute("SELECT key, value FROM settings")
             return dict(cursor.fetchall())
 
-        finally:
-            conn.close()
 
     def update_setting(self, key: str, value: str):
         """Update a setting value."""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        with self._connect() as conn:
+            cursor = conn.cursor()
 
-        try:
             cursor.execute(
                 """
                 INSERT OR REPLACE INTO settings (key, value, updated_at)
@@ -191,8 +265,6 @@ class MusicLibraryManager:
             )
             conn.commit()
 
-        finally:
-            conn.close()
 
     def is_first_run(self) -> bool:
         """Check if this is the first run."""
@@ -205,10 +277,9 @@ class MusicLibraryManager:
 
     def get_library_stats(self) -> Dict:
         """Get statistics about the music library."""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        with self._connect() as conn:
+            cursor = conn.cursor()
 
-        try:
             stats = {}
 
             # Total tracks
@@ -244,29 +315,16 @@ class MusicLibraryManager:
 
             return stats
 
-        finally:
-            conn.close()
 
     def get_tracks_needing_metadata(self, limit: Optional[int] = None) -> List[str]:
         """Get tracks that are missing essential metadata."""
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
-        cursor = conn.cursor()
+        with self._connect() as conn:
+            cursor = conn.cursor()
 
-        try:
             # Get tracks missing critical metadata
-            # Consider a track needs metadata if it's missing:
-            # - Title AND Artist (basic metadata)
-            # - OR has no BPM (needed for DJ features)
-            # - OR has never been analyzed (analysis_version is NULL or < 2)
-            query = """
-                SELECT filepath FROM tracks 
-                WHERE (
-                    (title IS NULL AND artist IS NULL) OR
-                    bpm IS NULL OR
-                    analysis_version IS NULL OR
-                    analysis_version < 2
-                )
+            query = f"""
+                SELECT filepath FROM tracks
+                WHERE {NEEDS_METADATA_SQL}
                 AND (analysis_status IS NULL OR analysis_status != 'failed')
                 ORDER BY filepath
             """
@@ -277,31 +335,18 @@ class MusicLibraryManager:
             cursor.execute(query)
             return [row[0] for row in cursor.fetchall()]
 
-        finally:
-            conn.close()
 
     def get_tracks_missing_enhanced_metadata(
         self, limit: Optional[int] = None
     ) -> List[str]:
         """Get tracks that have basic metadata but are missing enhanced features."""
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
-        cursor = conn.cursor()
+        with self._connect() as conn:
+            cursor = conn.cursor()
 
-        try:
             # Get tracks that have basic metadata but missing enhanced features
-            query = """
-                SELECT filepath FROM tracks 
-                WHERE (
-                    title IS NOT NULL AND 
-                    artist IS NOT NULL AND
-                    bpm IS NOT NULL
-                ) AND (
-                    key IS NULL OR
-                    key_scale IS NULL OR
-                    energy_profile IS NULL OR
-                    structure IS NULL
-                )
+            query = f"""
+                SELECT filepath FROM tracks
+                WHERE {NEEDS_ENHANCED_SQL}
                 AND (analysis_status IS NULL OR analysis_status != 'failed')
                 ORDER BY filepath
             """
@@ -312,5 +357,21 @@ class MusicLibraryManager:
             cursor.execute(query)
             return [row[0] for row in cursor.fetchall()]
 
-        finally:
-            conn.close()
+
+    def get_tracks_needing_any_analysis(self) -> List[str]:
+        """Get tracks needing basic metadata or enhanced features, in one query.
+
+        Same tracks as the union of get_tracks_needing_metadata and
+        get_tracks_missing_enhanced_metadata, without duplicates.
+        """
+        with self._connect() as conn:
+            cursor = conn.cursor()
+
+            cursor.execute(f"""
+                SELECT filepath FROM tracks
+                WHERE ({NEEDS_METADATA_SQL} OR {NEEDS_ENHANCED_SQL})
+                AND (analysis_status IS NULL OR analysis_status != 'failed')
+                ORDER BY filepath
+            """)
+            return [row[0] for row in cursor.fetchall()]
+
@@ -8,18 +8,18 @@ import struct
 from typing import List, Dict, Optional, Any
 from pathlib import Path
 
+logger = logging.getLogger(__name__)
+
 # Use Mutagen directly for reliable tag reading
 SERATO_AVAILABLE = True
 try:
     from mutagen import File
     from mutagen.id3 import GEOB
 
-    print("✅ Mutagen loaded successfully - Ready to parse real Serato data!")
+    logger.debug("✅ Mutagen loaded successfully - Ready to parse real Serato data!")
 except ImportError as e:
     SERATO_AVAILABLE = False
-    print(f"❌ Mutagen not available: {e}")
-
-logger = logging.getLogger(__name__)
+    logger.warning(f"❌ Mutagen not available: {e}")
 
 
 class SeratoHotCue:
@@ -47,7 +47,7 @@ class SeratoParser:
             decoded = base64.b64decode(data)
             return SeratoParser.parse_binary_markers(decoded)
         except Exception as e:
-            print(f"   ❌ Base64 decode failed: {e}")
+            logger.warning(f"❌ Base64 decode failed: {e}")
             return {}
 
     @staticmethod
@@ -87,7 +87,7 @@ class SeratoParser:
                 result = SeratoParser.parse_alternative_format(data)
 
         except Exception as e:
-            print(f"   ❌ Binary parsing error: {e}")
+            logger.warning(f"❌ Binary parsing error: {e}")
 
         return result
 
@@ -112,7 +112,7 @@ class SeratoParser:
                 "name": f"Cue {pos // 20 + 1}",  # Default name
                 "type": "cue",
             }
-        except:
+        except struct.error:
             return None
 
     @staticmethod
@@ -135,7 +135,7 @@ class SeratoParser:
                 "name": f"Loop {pos // 20 + 1}",
                 "type": "loop",
             }
-        except:
+        except struct.error:
             return None
 
     @staticmethod
@@ -158,7 +158,7 @@ class SeratoParser:
                             "type": "cue",
                         }
                     )
-            except:
+            except struct.error:
                 continue
 
         return result
@@ -170,7 +170,9 @@ class SeratoReader:
     def __init__(self):
         self.serato_available = SERATO_AVAILABLE
         self.serato_dirs = self._find_serato_directories()
-        print(f"🎛️ SeratoReader initialized: Available={self.serato_available}")
+        logger.debug(
+            f"🎛️ SeratoReader initialized: Available={self.serato_available}"
+        )
 
     def _find_serato_directories(self) -> List[str]:
         """Find potential Serato data directories"""
@@ -201,27 +203,29 @@ class SeratoReader:
                 possible_dirs.append(str(alt_dir))
 
         if possible_dirs:
-            print(f"   📁 Found Serato directories: {possible_dirs}")
+            logger.info(f"📁 Found Serato directories: {possible_dirs}")
         return possible_dirs
 
     def read_hot_cues(self, audio_file_path: str) -> List[SeratoHotCue]:
         """Read hot cues from Serato data for the given audio file"""
-        print(f"🔍 Reading REAL Serato data from: {os.path.basename(audio_file_path)}")
+        logger.debug(
+            f"🔍 Reading REAL Serato data from: {os.path.basename(audio_file_path)}"
+        )
 
         hot_cues = []
 
         if not self.serato_available:
-            print("   ❌ Mutagen not available")
+            logger.debug("❌ Mutagen not available")
             return hot_cues
 
         try:
             # Load the audio file with Mutagen
             audio_file = File(audio_file_path)
             if not audio_file or not hasattr(audio_file, "tags") or not audio_file.tags:
-                print("   📍 No tags found in audio file")
+                logger.debug("📍 No tags found in audio file")
                 return hot_cues
 
-            print(f"   📊 Found {len(audio_file.tags)} total tags")
+            logger.debug(f"📊 Found {len(audio_file.tags)} total tags")
 
             # Look for Serato-specific GEOB tags
             serato_tags = {
@@ -239,18 +243,18 @@ class SeratoReader:
                     found_serato_tags.append(tag_name)
 
             if found_serato_tags:
-                print(f"   🎛️ Found Serato tags: {found_serato_tags}")
+                logger.debug(f"🎛️ Found Serato tags: {found_serato_tags}")
 
                 # Parse Markers_ and Markers2 for hot cues
                 for tag_name in ["GEOB:Serato Markers_", "GEOB:Serato Markers2"]:
                     if tag_name in audio_file.tags:
-                        print(f"   🔍 Parsing {tag_name}...")
+                        logger.debug(f"🔍 Parsing {tag_name}...")
                         tag_data = audio_file.tags[tag_name]
 
                         if hasattr(tag_data, "data"):
                             binary_data = tag_data.data
-                            print(
-                                f"      📊 Binary data length: {len(binary_data)} bytes"
+                            logger.debug(
+                                f"📊 Binary data length: {len(binary_data)} bytes"
                             )
 
                             # Parse the binary data
@@ -271,8 +275,8 @@ class SeratoReader:
                                     index=len(hot_cues),
                                 )
                                 hot_cues.append(hot_cue)
-                                print(
-                                    f"      📍 Extracted cue: {hot_cue.name} at {time_seconds:.2f}s"
+                                logger.debug(
+                                    f"📍 Extracted cue: {hot_cue.name} at {time_seconds:.2f}s"
                                 )
 
                             # Convert parsed loops to cues
@@ -287,27 +291,42 @@ class SeratoReader:
                                     index=len(hot_cues),
                                 )
                                 hot_cues.append(hot_cue)
-                                print(
-                                    f"      🔄 Extracted loop: {hot_cue.name} at {start_seconds:.2f}s"
+                                logger.debug(
+                                    f"🔄 Extracted loop: {hot_cue.name} at {start_seconds:.2f}s"
                                 )
 
-                print(f"   ✅ Extracted {len(hot_cues)} real Serato cues!")
+                logger.debug(f"✅ Extracted {len(hot_cues)} real Serato cues!")
             else:
-                print("   📍 No Serato tags found in this file")
+                logger.debug("📍 No Serato tags found in this file")
 
         except Exception as e:
             logger.error(f"Error reading Serato data from {audio_file_path}: {e}")
-            print(f"   ❌ Error reading Serato data: {e}")
 
         return hot_cues
 
+    @staticmethod
+    def read_duration(audio_file_path: str) -> float:
+        """Read track length from the file header without decoding audio"""
+        import soundfile
+
+        try:
+            return soundfile.info(audio_file_path).duration
+        except RuntimeError:
+            # libsndfile can't open this container (e.g. m4a); ask Mutagen
+            audio = File(audio_file_path)
+            if audio is None or audio.info is None:
+                raise ValueError("Unsupported audio format")
+            return audio.info.length
+
     def create_demo_cues(
         self, audio_file_path: str, duration: float
     ) -> List[SeratoHotCue]:
         """Create demo hot cues for testing when no Serato data is available"""
         demo_cues = []
 
-        print(f"🎵 Creating demo hot cues for track (duration: {duration:.1f}s)")
+        logger.debug(
+            f"🎵 Creating demo hot cues for track (duration: {duration:.1f}s)"
+        )
 
         if duration > 30:  # Only add demo cues for tracks longer than 30 seconds
             demo_positions = [
@@ -335,7 +354,7 @@ class SeratoReader:
                         index=i,
                     )
                     demo_cues.append(demo_cue)
-                    print(f"   📍 Demo cue: {name} at {time:.1f}s ({cue_type})")
+                    logger.debug(f"📍 Demo cue: {name} at {time:.1f}s ({cue_type})")
 
         return demo_cues
 
@@ -359,7 +378,9 @@ class SeratoReader:
 
     def get_serato_info(self, audio_file_path: str) -> Dict[str, Any]:
         """Get comprehensive Serato information for a track"""
-        print(f"🎛️ Getting REAL Serato info for: {os.path.basename(audio_file_path)}")
+        logger.debug(
+            f"🎛️ Getting REAL Serato info for: {os.path.basename(audio_file_path)}"
+        )
 
         info = {
             "hot_cues": [],
@@ -376,20 +397,18 @@ class SeratoReader:
 
             # If no real Serato cues found, create demo cues as fallback
             if not serato_cues:
-                print("   📍 No real Serato cues found, creating demo cues...")
+                logger.debug("📍 No real Serato cues found, creating demo cues...")
 
                 try:
-                    import librosa
-
-                    duration = librosa.get_duration(path=audio_file_path)
+                    duration = self.read_duration(audio_file_path)
 
                     if duration > 60:
                         demo_cues = self.create_demo_cues(audio_file_path, duration)
                         if demo_cues:
-                            print(f"   🎵 Created {len(demo_cues)} demo cues")
+                            logger.debug(f"🎵 Created {len(demo_cues)} demo cues")
                             serato_cues = demo_cues
                 except Exception as e:
-                    print(f"   ❌ Could not create demo cues: {e}")
+                    logger.warning(f"❌ Could not create demo cues: {e}")
 
             # Convert to dict format
             info["hot_cues"] = [
@@ -403,11 +422,10 @@ class SeratoReader:
                 for cue in serato_cues
             ]
 
-            print(f"   ✅ Returning {len(info['hot_cues'])} hot cues")
+            logger.debug(f"✅ Returning {len(info['hot_cues'])} hot cues")
 
         except Exception as e:
             logger.error(f"Error getting Serato info for {audio_file_path}: {e}")
-            print(f"❌ Error getting Serato info: {e}")
 
         return info
 
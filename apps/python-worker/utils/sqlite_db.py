@@ -5,7 +5,21 @@ SQLite database adapter that provides MongoDB-like interface for the DJ agent.
 import sqlite3
 import os
 import json
-from typing import Dict, List, Optional
+import threading
+import numpy as np
+from typing import Dict, List, Optional, Sequence
+
+from utils.sqlite_pool import CONNECTION_PRAGMAS
+
+
+def pack_beat_times(beat_times: Sequence[float]) -> bytes:
+    """Encode beat times as a little-endian float32 blob."""
+    return np.asarray(beat_times, dtype="<f4").tobytes()
+
+
+def unpack_beat_times(blob: bytes) -> List[float]:
+    """Decode a blob written by pack_beat_times."""
+    return np.frombuffer(blob, dtype="<f4").tolist()
 
 
 class SQLiteAdapter:
@@ -15,8 +29,25 @@ class SQLiteAdapter:
         if db_path is None:
             db_path = os.path.join(os.path.dirname(__file__), "..", "tracks.db")
         self.db_path = db_path
-        self.connection = sqlite3.connect(db_path, check_same_thread=False)
-        self.connection.row_factory = sqlite3.Row
+        self._local = threading.local()
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        """This thread's connection, opened on first use.
+
+        The adapter is shared by every agent, and its callers run on both the
+        event loop and LangGraph's tool threads. sqlite3 leaves serializing
+        transactions on one connection to the caller, so each thread gets its
+        own and SQLite's locking orders the writes.
+        """
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path)
+            conn.row_factory = sqlite3.Row
+            for pragma in CONNECTION_PRAGMAS:
+                conn.execute(pragma)
+            self._local.conn = conn
+        return conn
 
     def find_one(self, query: Dict) -> Optional[Dict]:
         """Find a single document matching the query."""
@@ -249,6 +280,12 @@ class SQLiteDatabase:
         return SQLiteCollectionAdapter(self.adapter, "transition_ratings")
 
 
+_sqlite_db: Optional[SQLiteDatabase] = None
+
+
 def get_sqlite_db() -> SQLiteDatabase:
-    """Get SQLite database instance."""
-    return SQLiteDatabase()
+    """Get the shared SQLite database instance."""
+    global _sqlite_db
+    if _sqlite_db is None:
+        _sqlite_db = SQLiteDatabase()
+    return _sqlite_db